@@ -0,0 +1,85 @@
+"""
+CD-TEXT decoding throughput in strings per second.
+The corpus mixes plain ASCII (the common case, which should cost nothing), latin-1 octal escapes,
+and Japanese text escaped as MS-JIS bytes.
+
+	python3 bench/cdtext.py [--strings N] [--repeat N]
+
+The previous decoding (unicode_escape of every string) is timed alongside for comparison.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tocparser import lex
+import tocparser
+
+def escape(b):
+	"""
+	Quotes bytes @b the way cdrdao writes CD-TEXT: printable ASCII as is, everything else as octal escapes.
+	"""
+	return '"' + ''.join(chr(c) if 32 <= c < 127 and c not in (34, 92) else '\\%03o' % c for c in b) + '"'
+
+def strings(n, seed):
+	"""
+	Returns (quoted token, codec) pairs: 70% ASCII, 20% latin-1, 10% Japanese.
+	"""
+	r = random.Random(seed)
+	ascii = ['Track Title %d', 'Some Performer %d', 'Remix "%d"', 'Composer %d']
+	latin = ['Café %d', 'Björk %d', 'Naïve Été %d']
+	japanese = ['テスト %d', '日本の曲 %d']
+
+	ret = []
+	for i in range(n):
+		x = r.random()
+		if x < 0.7:
+			ret.append( (escape((r.choice(ascii) % i).encode('ascii')), 'latin-1') )
+		elif x < 0.9:
+			ret.append( (escape((r.choice(latin) % i).encode('latin-1')), 'latin-1') )
+		else:
+			ret.append( (escape((r.choice(japanese) % i).encode('cp932')), 'cp932') )
+	return ret
+
+def old(s, codec):
+	return s[1:-1].encode('utf-8').decode('unicode_escape')
+
+def new(s, codec):
+	return tocparser._decode(lex._text(s), codec)
+
+def rate(func, data, repeat):
+	best = None
+	for i in range(repeat):
+		t0 = time.process_time()
+		for s,codec in data:
+			func(s, codec)
+		dt = time.process_time() - t0
+		if best is None or dt < best:
+			best = dt
+	return len(data) / best
+
+def main():
+	p = argparse.ArgumentParser()
+	p.add_argument('--strings', type=int, default=50000)
+	p.add_argument('--repeat', type=int, default=10)
+	args = p.parse_args()
+
+	data = strings(args.strings, 1)
+	plain = [d for d in data if '\\' not in d[0]]
+
+	print("%d strings (%d plain ASCII)" % (len(data), len(plain)))
+	print("  unicode_escape, mixed: %10.0f strings/s" % rate(old, data, args.repeat))
+	print("         decoder, mixed: %10.0f strings/s" % rate(new, data, args.repeat))
+	print("  unicode_escape, ASCII: %10.0f strings/s" % rate(old, plain, args.repeat))
+	print("         decoder, ASCII: %10.0f strings/s" % rate(new, plain, args.repeat))
+
+	# The old method cannot decode multi-byte character sets at all
+	bad = sum(1 for s,codec in data if codec != 'latin-1' and old(s, codec) != new(s, codec))
+	print("  strings unicode_escape gets wrong: %d" % bad)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,66 @@
+"""
+Synthetic TOC files for the benchmarks in this directory.
+"""
+
+import random
+
+_words = ['Love', 'Night', 'Blue', 'River', 'Song', 'Heart', 'Road', 'Fire', 'Rain', 'Home', 'Dream', 'Light']
+
+def msf(frames):
+	"""
+	Formats @frames as MM:SS:FF as used in TOC files.
+	"""
+	return "%02d:%02d:%02d" % (frames // 4500, (frames // 75) % 60, frames % 75)
+
+def disc(ntracks=12, seed=0, path='data.wav', cdtext=True, isrc=True):
+	"""
+	Generates the text of a CD_DA TOC file with @ntracks audio tracks as cdrdao would write it.
+	"""
+	r = random.Random(seed)
+	performer = ' '.join(r.sample(_words, 2))
+
+	lines = ['CD_DA', '', 'CATALOG "%013d"' % r.randrange(10**13), '']
+	if cdtext:
+		lines += [
+			'CD_TEXT {',
+			'  LANGUAGE_MAP {',
+			'    0 : 9',
+			'  }',
+			'',
+			'  LANGUAGE 0 {',
+			'    TITLE "%s"' % ' '.join(r.sample(_words, 3)),
+			'    PERFORMER "%s"' % performer,
+			'    SIZE_INFO { 1, 1, %d, 0, 8, 9, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,' % ntracks,
+			'                0, 0, 0, 0, 0, 0, 0, 0, 3, 1, 0, 0, 0, 0, 9, 0,',
+			'                0, 0, 0, 0}',
+			'  }',
+			'}',
+			'',
+		]
+
+	start = 0
+	for n in range(1, ntracks+1):
+		dur = r.randrange(120*75, 420*75)
+		lines += [
+			'',
+			'// Track %d' % n,
+			'TRACK AUDIO',
+			'NO COPY',
+			'NO PRE_EMPHASIS',
+			'TWO_CHANNEL_AUDIO',
+		]
+		if isrc:
+			lines.append('ISRC "US%s%07d"' % ('ABC', r.randrange(10**7)))
+		if cdtext:
+			lines += [
+				'CD_TEXT {',
+				'  LANGUAGE 0 {',
+				'    TITLE "%s"' % ' '.join(r.sample(_words, 2)),
+				'    PERFORMER "%s"' % performer,
+				'  }',
+				'}',
+			]
+		lines.append('FILE "%s" %s %s' % (path, msf(start) if start else '0', msf(dur)))
+		start += dur
+
+	return '\n'.join(lines) + '\n'
@@ -0,0 +1,659 @@
+"""
+Fuzz and performance regression harness for the parser.
+Everything is driven by seeded generators so that a failure can be reproduced from the seed it prints.
+
+  roundtrip  Random but valid discs are rendered to TOC text and parsed, and must come back exactly as generated.
+             The recovering parser must agree with the strict one, and tokenize() with the PLY lexer.
+  examples   Small hand written discs (mostly from bug reports) must give exactly what is expected of them.
+  mutate     Those texts are damaged (lines dropped, duplicated, shuffled, cut short, junk inserted).
+             Parsing must then either succeed or raise a TOCError, and must never fail when recovering.
+  scaling    Pathological inputs are parsed at doubling sizes, and parse time must grow linearly with input size.
+             The inputs are huge strings, many LANGUAGE blocks, thousands of INDEX lines, long SIZE_INFO lists,
+             unterminated strings, and lines full of errors.
+
+Every parse runs under a wall time cap. The exit status is 1 if anything failed.
+
+	python3 bench/fuzz.py [--seed N] [--cases N] [--cap SECONDS] [--max-exponent X] [--scale X] [--save DIR] [CHECK ...]
+"""
+
+import argparse
+import math
+import os
+import random
+import signal
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import tocparser
+from tocparser import lex
+
+import corpus
+
+class Timeout(BaseException):
+	"""
+	Raised when a parse runs over the wall time cap (a BaseException so that nothing on the way swallows it).
+	"""
+	pass
+
+def _alarm(signum, frame):
+	raise Timeout()
+
+def capped(cap, func, *args):
+	"""
+	Returns (@func(*args), seconds taken), raising Timeout after @cap seconds.
+	"""
+	signal.setitimer(signal.ITIMER_REAL, cap)
+	t0 = time.perf_counter()
+	try:
+		ret = func(*args)
+		return ret, time.perf_counter() - t0
+	finally:
+		signal.setitimer(signal.ITIMER_REAL, 0)
+
+class Failures:
+	"""
+	Collects failures, printing each and saving the input that caused it to @savedir if given.
+	"""
+
+	def __init__(self, savedir):
+		self.count = 0
+		self._savedir = savedir
+
+	def add(self, check, seed, msg, txt=None):
+		self.count += 1
+		print("FAIL %s seed=%s: %s" % (check, seed, msg))
+		if self._savedir is not None and txt is not None:
+			os.makedirs(self._savedir, exist_ok=True)
+			path = os.path.join(self._savedir, "%s-%s.toc" % (check, seed))
+			with open(path, 'w', encoding='latin-1', errors='replace') as f:
+				f.write(txt)
+			print("     input saved to %s" % path)
+
+# --------------------------------------------------------------------------------
+# Random valid discs
+
+_latin = 'éöüñçåøà'
+_japanese = ['テスト', '日本', '曲', '東京', 'ソフト']
+_datamodes = sorted(m for m in tocparser._blocksizes if m != 'AUDIO')
+_fields = ['title', 'performer', 'songwriter', 'composer', 'arranger', 'message']
+
+def cdtext(r, codec):
+	"""
+	Random CD-TEXT string that can be encoded with @codec.
+	"""
+	words = [r.choice(corpus._words) for i in range(r.randint(1, 4))]
+	if codec == 'cp932':
+		words.append(r.choice(_japanese))
+	elif r.random() < 0.3:
+		# Escaped bytes are never taken as UTF-8, so an accented letter must come back as latin-1
+		words.append(r.choice(_latin) + r.choice(corpus._words).lower())
+	if r.random() < 0.2:
+		words.append('"quoted"')
+	if r.random() < 0.1:
+		words.append('back\\slash')
+	r.shuffle(words)
+	return ' '.join(words)
+
+def quote(r, s, codec):
+	"""
+	Quotes @s the way cdrdao writes it (octal escapes for anything not printable ASCII), with quotes and
+	backslashes escaped either way.
+	"""
+	out = ['"']
+	for c in s.encode(codec):
+		if c in (34, 92) and r.random() < 0.5:
+			out.append('\\' + chr(c))
+		elif 32 <= c < 127 and c not in (34, 92):
+			out.append(chr(c))
+		else:
+			out.append('\\%03o' % c)
+	out.append('"')
+	return ''.join(out)
+
+def langblock(r, num, codec, header, indent):
+	"""
+	Returns (lines, expected dictionary) of a LANGUAGE block.
+	"""
+	meta = {}
+	lines = ['%sLANGUAGE %d {' % (indent, num)]
+	for field in r.sample(_fields, r.randint(1, 3)):
+		meta[field] = cdtext(r, codec)
+		lines.append('%s  %s %s' % (indent, field.upper(), quote(r, meta[field], codec)))
+
+	if header and r.random() < 0.3:
+		meta['upc_ean'] = '%013d' % r.randrange(10**13)
+		lines.append('%s  UPC_EAN "%s"' % (indent, meta['upc_ean']))
+	if header and r.random() < 0.3:
+		meta['genre'] = [r.randrange(256) for i in range(r.randint(1, 4))]
+		lines.append('%s  GENRE { %s }' % (indent, ', '.join(map(str, meta['genre']))))
+
+	lines.append('%s}' % indent)
+	return lines, meta
+
+def disc(r):
+	"""
+	Returns (text, expected summary) of a random valid disc; the expected summary is what summary() of the parsed TOC gives.
+	"""
+	exp = {'type': r.choice(['CD_DA', 'CD_ROM', 'CD_ROM_XA']), 'catalog': None, 'langmap': {}, 'meta': {}, 'tracks': []}
+	lines = [exp['type'], '']
+
+	if r.random() < 0.5:
+		exp['catalog'] = '%013d' % r.randrange(10**13)
+		lines.append('CATALOG "%s"' % exp['catalog'])
+
+	# Languages: (index, language code, codec)
+	langs = []
+	for i in range(r.choice([0, 1, 1, 2, 3])):
+		code, codec = r.choice([(9, 'latin-1'), (8, 'latin-1'), (105, 'cp932')])
+		langs.append( (i, code, codec) )
+
+	if langs:
+		lines += ['CD_TEXT {', '  LANGUAGE_MAP {']
+		for i, code, codec in langs:
+			lines.append('    %d : %d' % (i, code))
+			exp['langmap'][i] = code
+		lines.append('  }')
+
+		for i, code, codec in langs:
+			block, meta = langblock(r, i, codec, True, '  ')
+			if r.random() < 0.5:
+				# Character code in the first SIZE_INFO byte rather than implied by the language
+				meta['sizeinfo'] = [0x80 if codec == 'cp932' else 0x00] + [r.randrange(256) for j in range(r.randint(0, 35))]
+				block.insert(-1, '    SIZE_INFO { %s }' % ', '.join(map(str, meta['sizeinfo'])))
+			lines += block
+			exp['meta'][i] = meta
+		lines.append('}')
+
+	for n in range(1, r.randint(1, 15) + 1):
+		lines.append('')
+		lines += track(r, n, langs, exp['tracks'])
+
+	return '\n'.join(lines) + '\n', exp
+
+def track(r, n, langs, tracks):
+	"""
+	Returns the lines of random track @n, appending what is expected of it to @tracks.
+	"""
+	audio = r.random() < 0.8
+	mode = 'AUDIO' if audio else r.choice(_datamodes)
+	subchannel = r.choice(['RW', 'RW_RAW']) if r.random() < 0.1 else None
+	exp = {'number': n, 'mode': mode, 'subchannel': subchannel, 'copy': False, 'preemphasis': False, 'channels': 2 if audio else None,
+		'isrc': None, 'meta': {}, 'pregap': 0, 'indices': [], 'segments': [], 'length': 0}
+
+	lines = ['// Track %d' % n, 'TRACK %s%s' % (mode, ' ' + subchannel if subchannel else '')]
+
+	# Flags may come in any order
+	flags = []
+	if r.random() < 0.5:
+		exp['copy'] = r.random() < 0.5
+		flags.append(['COPY'] if exp['copy'] else ['NO COPY'])
+	if r.random() < 0.5:
+		exp['preemphasis'] = r.random() < 0.5
+		flags.append(['PRE_EMPHASIS'] if exp['preemphasis'] else ['NO PRE_EMPHASIS'])
+	if audio and r.random() < 0.7:
+		exp['channels'] = r.choice([2, 4])
+		flags.append(['TWO_CHANNEL_AUDIO' if exp['channels'] == 2 else 'FOUR_CHANNEL_AUDIO'])
+	if r.random() < 0.5:
+		exp['isrc'] = 'US%s%07d' % (''.join(r.choice('ABCXYZ') for i in range(3)), r.randrange(10**7))
+		flags.append(['ISRC "%s"' % exp['isrc']])
+	if langs and r.random() < 0.7:
+		block = ['CD_TEXT {']
+		for i, code, codec in langs:
+			if r.random() < 0.8:
+				b, exp['meta'][i] = langblock(r, i, codec, False, '  ')
+				block += b
+		block.append('}')
+		if exp['meta']:
+			flags.append(block)
+
+	pregap = None
+	if r.random() < 0.2:
+		pregap = r.randrange(1, 3*75)
+		flags.append(['PREGAP %s' % corpus.msf(pregap)])
+
+	r.shuffle(flags)
+	for f in flags:
+		lines += f
+
+	# Expected segments are (kind, path, offset, Bytes, Samples); @spans holds the length of each one in samples or bytes
+	# of the track for START
+	size = tocparser._sectorsize(mode, subchannel)
+	unit = 588 if audio else size
+	segs = exp['segments']
+	spans = []
+
+	def add(kind, path, offset, start, length, segunit):
+		segs.append( (kind, path, offset, (offset + start * size // segunit, length * size // segunit), (start * 588 // segunit, length * 588 // segunit) if audio else None) )
+		spans.append( length * unit // segunit )
+
+	if pregap is not None:
+		add('silence', None, 0, 0, pregap * size, size)
+		exp['pregap'] = pregap
+
+	# START after the first segment(s): with a time it is the pregap, without one the length of what came before
+	nsegs = r.randint(1, 3)
+	startat = r.randrange(nsegs + 1) if r.random() < 0.3 else None
+	starttime = None
+	if startat is not None and r.random() < 0.5:
+		starttime = r.randrange(0, 3*75)
+
+	for k in range(nsegs):
+		if k == startat:
+			lines.append('START %s' % corpus.msf(starttime) if starttime is not None else 'START')
+			exp['pregap'] = starttime if starttime is not None else exp['pregap'] + sum(spans[1 if pregap is not None else 0:]) // unit
+
+		length = r.randrange(75, 300*75)
+		if audio:
+			kind = r.choice(['file', 'file', 'silence', 'datafile'])
+			if kind == 'file':
+				path = r.choice(['data.wav', 'disc 1/track.wav', 'caf\\351.wav'])
+				start = r.randrange(0, 3000*75)
+				offset = r.choice([0, 0, r.randrange(1, 10**6)])
+				if r.random() < 0.3:
+					# Sample counts, not always a whole number of frames
+					start = start * 588 + (r.randrange(588) if subchannel is None and r.random() < 0.5 else 0)
+					length = length * 588 + (r.randrange(588) if subchannel is None and r.random() < 0.5 else 0)
+					lines.append('FILE "%s" %s%d %d' % (path, '#%d ' % offset if offset else '', start, length))
+				else:
+					lines.append('FILE "%s" %s%s %s' % (path, '#%d ' % offset if offset else '', corpus.msf(start), corpus.msf(length)))
+					start *= 588
+					length *= 588
+				add('file', path.replace('\\351', 'é'), offset, start, length, 588)
+			elif kind == 'datafile':
+				# Always bytes, even in an audio track
+				lines.append('DATAFILE "data.bin" %d' % (length * size))
+				add('datafile', 'data.bin', 0, 0, length * size, size)
+			else:
+				lines.append('SILENCE %s' % corpus.msf(length))
+				add('silence', None, 0, 0, length * 588, 588)
+		else:
+			kind = r.choice(['datafile', 'zero'])
+			if kind == 'datafile':
+				offset = r.choice([0, r.randrange(1, 10**6)])
+				lines.append('DATAFILE "data.bin" %s%s' % ('#%d ' % offset if offset else '', corpus.msf(length) if r.random() < 0.5 else length * size))
+				add('datafile', 'data.bin', offset, 0, length * size, size)
+			else:
+				lines.append('ZERO %s' % corpus.msf(length))
+				add('zero', None, 0, 0, length * size, size)
+
+	if startat == nsegs:
+		lines.append('START %s' % corpus.msf(starttime) if starttime is not None else 'START')
+		exp['pregap'] = starttime if starttime is not None else exp['pregap'] + sum(spans[1 if pregap is not None else 0:]) // unit
+
+	# A partial frame at the end takes a whole one on the disc
+	exp['length'] = -(-sum(spans) // unit)
+
+	t = 0
+	for k in range(r.choice([0, 0, 1, 3])):
+		t += r.randrange(75, 60*75)
+		lines.append('INDEX %s' % corpus.msf(t))
+		exp['indices'].append(t)
+
+	tracks.append(exp)
+	return lines
+
+def summary(toc):
+	"""
+	Everything parsed from @toc in the same form as the expected summary from disc().
+	"""
+	h = toc.Header
+	ret = {
+		'type': toc.Type,
+		'catalog': toc.Catalog,
+		'langmap': {k: v[0] for k,v in h.LangMap.items()} if h is not None else {},
+		'meta': h.Meta if h is not None else {},
+		'tracks': [],
+	}
+
+	for t in toc.Tracks:
+		ret['tracks'].append({
+			'number': t.Number,
+			'mode': t.Mode,
+			'subchannel': t.SubChannelMode,
+			'copy': t.Copy,
+			'preemphasis': t.PreEmphasis,
+			'channels': t.Channels,
+			'isrc': t.ISRC,
+			'meta': t.Meta,
+			'pregap': t.Pregap.TotalFrames,
+			'indices': [i.TotalFrames for i in t.Indices],
+			'segments': [(s.Kind, s.FilePath, s.Offset, s.Bytes, s.Samples) for s in t.Segments],
+			'length': t.Length.TotalFrames,
+		})
+
+	return ret
+
+def firstdiff(a, b, path=''):
+	"""
+	Describes where @a and @b first differ.
+	"""
+	if isinstance(a, dict) and isinstance(b, dict):
+		for k in sorted(set(a) | set(b), key=str):
+			if a.get(k) != b.get(k):
+				return firstdiff(a.get(k), b.get(k), "%s.%s" % (path, k))
+	elif isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+		for i in range(len(a)):
+			if a[i] != b[i]:
+				return firstdiff(a[i], b[i], "%s[%d]" % (path, i))
+	return "%s: %r != %r" % (path or '.', a, b)
+
+def loads(txt, recover=False):
+	return tocparser.TOC.loads(txt.encode('latin-1'), recover=recover)
+
+def roundtrip(args, fails):
+	"""
+	Valid discs must parse back to what was generated, the same with and without recovery.
+	"""
+	try:
+		import ply.lex
+		haveply = True
+	except ImportError:
+		haveply = False
+
+	for i in range(args.cases):
+		seed = "%d.%d" % (args.seed, i)
+		txt, exp = disc(random.Random(seed))
+
+		try:
+			toc, dt = capped(args.cap, loads, txt)
+			got = summary(toc)
+			if got != exp:
+				fails.add('roundtrip', seed, firstdiff(exp, got), txt)
+				continue
+
+			toc, dt = capped(args.cap, loads, txt, True)
+			if toc.Diagnostics or summary(toc) != exp:
+				fails.add('roundtrip', seed, "recovering parse differs: %s" % (toc.Diagnostics or firstdiff(exp, summary(toc))), txt)
+				continue
+
+			if haveply:
+				a = [(t.type, t.value, t.lineno, t.lexpos) for t in lex.lexer(txt)]
+				b = list(lex.tokenize(txt))
+				if a != b:
+					fails.add('roundtrip', seed, "tokenize() and lexer() differ", txt)
+		except Timeout:
+			fails.add('roundtrip', seed, "over the %.1f s cap" % args.cap, txt)
+		except Exception as e:
+			fails.add('roundtrip', seed, "%s: %s" % (type(e).__name__, e), txt)
+
+	print("roundtrip: %d discs" % args.cases)
+
+# --------------------------------------------------------------------------------
+# Discs with known answers
+
+# (name, TOC text, function of the parsed TOC, expected result)
+_examples = [
+	# A TOC parsed again no longer has the digest of what it was loaded from
+	('digest after parse', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 100\n',
+		lambda toc: (toc.parse('CD_DA\nTRACK AUDIO\nFILE "b.wav" 0 100\n'), toc.Digest, len(tocparser.diff(loads('CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 100\n'), toc)))[1:], (None, 1)),
+
+	# A track that starts later on the disc has moved, even if it is at the start of its own file
+	('diff of a moved track', 'CD_DA\nTRACK AUDIO\nFILE "1.wav" 0 01:00:00\nTRACK AUDIO\nFILE "2.wav" 0 02:00:00\n',
+		lambda toc: [type(c).__name__ for c in tocparser.diff(toc, loads('CD_DA\nTRACK AUDIO\nFILE "1.wav" 0 01:30:00\nTRACK AUDIO\nFILE "2.wav" 0 02:00:00\n'))],
+		['TrackResized', 'TrackMoved']),
+
+	# The disc type and the track and sub-channel modes are compared
+	('diff of the disc type', 'CD_ROM\nTRACK MODE1\nDATAFILE "a.bin" 01:00:00\n',
+		lambda toc: [(c.Field, c.OldValue, c.NewValue) for c in tocparser.diff(toc, loads('CD_DA\nTRACK MODE1\nDATAFILE "a.bin" 01:00:00\n'))],
+		[('type', 'CD_ROM', 'CD_DA')]),
+	('diff of the track mode', 'CD_ROM\nTRACK MODE1_RAW\nDATAFILE "a.bin" 01:00:00\n',
+		lambda toc: [(c.Field, c.OldValue, c.NewValue) for c in tocparser.diff(toc, loads('CD_ROM\nTRACK MODE2_RAW RW\nDATAFILE "a.bin" 01:00:00\n'))],
+		[('mode', 'MODE1_RAW', 'MODE2_RAW'), ('subchannelmode', None, 'RW')]),
+
+	# Silence or another file in a track changes it even though the data in FilePath is the same
+	('diff of added silence', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\n',
+		lambda toc: [(type(c).__name__, getattr(c, 'Field', None)) for c in tocparser.diff(toc, loads('CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\nSILENCE 00:05:00\n'))],
+		[('TrackResized', None), ('TrackMetaChanged', 'segments')]),
+	('diff of an added file', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\n',
+		lambda toc: [(type(c).__name__, getattr(c, 'Field', None)) for c in tocparser.diff(toc, loads('CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\nFILE "b.wav" 0 01:00:00\n'))],
+		[('TrackResized', None), ('TrackMetaChanged', 'segments')]),
+
+	# Every CD-TEXT item cdrdao writes
+	('reserved CD-TEXT items', 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { 0 : 9 }\n LANGUAGE 0 {\n  TOC_INFO2 { 1, 2 }\n  RESERVED1 "a"\n  RESERVED2 "b"\n  RESERVED3 "c"\n }\n}\nTRACK AUDIO\nFILE "a.wav" 0\n',
+		lambda toc: toc.Header.Meta, {0: {'tocinfo2': [1, 2], 'reserved1': 'a', 'reserved2': 'b', 'reserved3': 'c'}}),
+
+	# The end of input is reported where the file ends, after its last newline
+	('end of input', 'CD_DA\nTRACK AUDIO\n',
+		lambda toc: None, 'ParseError: line 3, column 1: Unexpected end of input (expected CD_TEXT, COPY, DATAFILE, FIFO, FILE, FOUR_CHANNEL_AUDIO, INDEX, ISRC, NO, PREGAP, PRE_EMPHASIS, SILENCE, START, SUBCHMODE, TWO_CHANNEL_AUDIO, ZERO)'),
+	('end of input without a newline', 'CD_DA\nTRACK AUDIO',
+		lambda toc: None, 'ParseError: line 2, column 12: Unexpected end of input (expected CD_TEXT, COPY, DATAFILE, FIFO, FILE, FOUR_CHANNEL_AUDIO, INDEX, ISRC, NO, PREGAP, PRE_EMPHASIS, SILENCE, START, SUBCHMODE, TWO_CHANNEL_AUDIO, ZERO)'),
+
+	# Only raw bytes in a language without a declared character set are taken as UTF-8
+	('raw UTF-8 CD-TEXT', 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { 0 : 9 }\n LANGUAGE 0 {\n  TITLE "\xc3\xa9t\xc3\xa9"\n }\n}\nTRACK AUDIO\nFILE "a.wav" 0 100\n',
+		lambda toc: toc.Header.Meta[0]['title'], 'été'),
+	('escaped CD-TEXT', 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { 0 : 9 }\n LANGUAGE 0 {\n  TITLE "\\303\\251t\\303\\251"\n }\n}\nTRACK AUDIO\nFILE "a.wav" 0 100\n',
+		lambda toc: toc.Header.Meta[0]['title'], 'Ã©tÃ©'),
+	('CD-TEXT declared as latin-1', 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { 0 : 9 }\n LANGUAGE 0 {\n  TITLE "\xc3\xa9t\xc3\xa9"\n  SIZE_INFO { 0, 1, 1 }\n }\n}\nTRACK AUDIO\nFILE "a.wav" 0 100\n',
+		lambda toc: toc.Header.Meta[0]['title'], 'Ã©tÃ©'),
+
+	# Sample counts that are not a whole number of frames are kept exactly
+	('unaligned samples', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 1000 5000\n',
+		lambda toc: (toc.Tracks[0].Segments[0].Samples, toc.Tracks[0].Segments[0].Bytes), ((1000, 5000), (4000, 20000))),
+	('unaligned samples in frames', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 1000 5000\n',
+		lambda toc: (toc.Tracks[0].FileStart.TotalFrames, toc.Tracks[0].FileEnd.TotalFrames), (1, 10)),
+
+	('unaligned samples in the segment plan', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 1000 5000\nTRACK AUDIO\nFILE "a.wav" #44 6000 3000\n',
+		lambda toc: {k: list(v) for k,v in toc.SegmentPlan().items()}, {'a.wav': [1, 4000, 20000, 1000, 5000, 2, 24044, 12000, 6000, 3000]}),
+
+	# DATAFILE lengths are bytes whatever the track mode
+	('DATAFILE in an audio track', 'CD_DA\nTRACK AUDIO\nDATAFILE "a.bin" 2352000\n',
+		lambda toc: (toc.Tracks[0].Segments[0].Bytes, toc.Tracks[0].Segments[0].Samples, toc.Tracks[0].FileDuration.TotalFrames), ((0, 2352000), (0, 588000), 1000)),
+	# Only segments that follow each other in the track are merged
+	('segment plan around another file', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 100\nFILE "b.wav" 0 100\nFILE "a.wav" 100 100\n',
+		lambda toc: {k: list(v) for k,v in toc.SegmentPlan().items()}, {'a.wav': [1, 0, 400, 0, 100, 1, 400, 400, 100, 100], 'b.wav': [1, 0, 400, 0, 100]}),
+	('segment plan around silence', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 100\nSILENCE 588\nFILE "a.wav" 100 100\n',
+		lambda toc: {k: list(v) for k,v in toc.SegmentPlan().items()}, {'a.wav': [1, 0, 400, 0, 100, 1, 400, 400, 100, 100]}),
+	('DATAFILE in an audio track in the segment plan', 'CD_DA\nTRACK AUDIO\nDATAFILE "a.bin" 2352000\n',
+		lambda toc: list(toc.SegmentPlan()['a.bin']), [1, 0, 2352000, 0, 588000]),
+
+	# FileStart to FileEnd is only what is read from FilePath; Length is the whole track on the disc
+	('PREGAP before the file', 'CD_DA\nTRACK AUDIO\nPREGAP 00:02:00\nFILE "a.wav" 0 04:00:00\nTRACK AUDIO\nFILE "a.wav" 04:00:00 01:00:00\n',
+		lambda toc: [(str(t.FileStart), str(t.FileEnd), str(t.FileDuration), str(t.Length), str(t.DiscStart)) for t in toc.Tracks],
+		[('00:00.00', '04:00.00', '04:00.00', '04:02.00', '00:02.00'), ('04:00.00', '05:00.00', '01:00.00', '01:00.00', '04:02.00')]),
+	('track in two files', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\nFILE "b.wav" 0 01:00:00\n',
+		lambda toc: (toc.Tracks[0].FilePath, str(toc.Tracks[0].FileDuration), str(toc.Tracks[0].Length), str(toc.TotalLength)),
+		('a.wav', '01:00.00', '02:00.00', '02:00.00')),
+	('track in two parts of a file', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\nFILE "a.wav" 01:00:00 01:00:00\n',
+		lambda toc: (str(toc.Tracks[0].FileEnd), str(toc.Tracks[0].Length)), ('02:00.00', '02:00.00')),
+
+	# A segment without a length runs to the end of its file, so where the tracks after it start is not known
+	('tracks without lengths', 'CD_DA\nTRACK AUDIO\nFILE "01.wav" 0\nTRACK AUDIO\nFILE "02.wav" 0\nINDEX 00:10:00\n',
+		lambda toc: ([(t.IndexOffsets, [i.TotalFrames for i in t.Indices], t.FileEnd, t.FileDuration, t.Length) for t in toc.Tracks], toc.TotalLength, tocparser.diff(toc, toc)),
+		([((0, 0), [], None, None, None), (None, [750], None, None, None)], None, [])),
+	('last track without a length', 'CD_DA\nTRACK AUDIO\nFILE "a.wav" 0 01:00:00\nTRACK AUDIO\nFILE "a.wav" 01:00:00\nINDEX 00:10:00\n',
+		lambda toc: ([t.IndexOffsets for t in toc.Tracks], str(toc.Tracks[1].FileStart), toc.Tracks[1].FileEnd, toc.TotalLength),
+		([(0, 0), (4500, 4500, 5250)], '01:00.00', None, None)),
+]
+
+def examples(args, fails):
+	"""
+	Each disc in _examples must give what is expected of it.
+	"""
+	for name, txt, get, exp in _examples:
+		try:
+			got = get(loads(txt))
+		except Exception as e:
+			got = "%s: %s" % (type(e).__name__, e)
+
+		if got != exp:
+			fails.add('examples', name, "%r != %r" % (got, exp), txt)
+
+	print("examples: %d discs" % len(_examples))
+
+# --------------------------------------------------------------------------------
+# Damaged discs
+
+_junk = ['}', '{', 'TRACK', 'TRACK AUDIO', 'FILE "x"', '00:01:02', 'CD_TEXT {', 'LANGUAGE 0 {', 'INDEX', 'junk', '"', '\\', '#', ',', '@@', '99999999999999999999']
+
+def mutate(r, txt):
+	"""
+	Damages @txt in one to four random ways.
+	"""
+	lines = txt.split('\n')
+	for i in range(r.randint(1, 4)):
+		k = r.randrange(len(lines))
+		op = r.randrange(6)
+		if op == 0:
+			del lines[k]
+		elif op == 1:
+			lines.insert(k, lines[r.randrange(len(lines))])
+		elif op == 2:
+			lines[k] = ''.join(r.sample(lines[k], len(lines[k])))
+		elif op == 3:
+			lines.insert(k, r.choice(_junk))
+		elif op == 4:
+			pos = r.randrange(len(lines[k]) + 1)
+			lines[k] = lines[k][:pos] + r.choice(_junk) + lines[k][pos:]
+		else:
+			# Cut short, possibly inside a string
+			joined = '\n'.join(lines)
+			lines = joined[:r.randrange(len(joined) + 1)].split('\n')
+		if not lines:
+			lines = ['']
+	return '\n'.join(lines)
+
+def mutations(args, fails):
+	"""
+	Damaged discs must parse or raise a TOCError, and must always parse when recovering.
+	"""
+	for i in range(args.cases):
+		seed = "%d.%d" % (args.seed, i)
+		r = random.Random(seed)
+		txt = mutate(r, disc(r)[0])
+
+		try:
+			try:
+				capped(args.cap, loads, txt)
+			except tocparser.TOCError:
+				pass
+
+			toc, dt = capped(args.cap, loads, txt, True)
+			for d in toc.Diagnostics:
+				if not isinstance(d, tocparser.TOCError) or d.Line < 1 or d.Column < 1:
+					fails.add('mutate', seed, "bad diagnostic %r" % d, txt)
+					break
+		except Timeout:
+			fails.add('mutate', seed, "over the %.1f s cap" % args.cap, txt)
+		except Exception as e:
+			fails.add('mutate', seed, "%s: %s" % (type(e).__name__, e), txt)
+
+	print("mutate: %d damaged discs" % args.cases)
+
+# --------------------------------------------------------------------------------
+# Pathological inputs, each a function of a size and whether to parse it recovering
+
+def hugetext(n):
+	# One title of about 6n characters, mostly escapes
+	return 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { 0 : 9 }\n LANGUAGE 0 {\n  TITLE "%s"\n }\n}\n' % ('ab\\351\\"' * n) + corpus.disc(1, cdtext=False), False
+
+def languages(n):
+	langmap = ' '.join('%d : 9' % i for i in range(n))
+	blocks = '\n'.join(' LANGUAGE %d {\n  TITLE "Title %d"\n  PERFORMER "Someone"\n }' % (i, i) for i in range(n))
+	return 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { %s }\n%s\n}\n' % (langmap, blocks) + corpus.disc(1, cdtext=False), False
+
+def indices(n):
+	return corpus.disc(1, cdtext=False) + ''.join('INDEX %s\n' % corpus.msf(75 * (i + 1)) for i in range(n)), False
+
+def sizeinfo(n):
+	nums = ', '.join(str(i % 256) for i in range(n))
+	return 'CD_DA\nCD_TEXT {\n LANGUAGE_MAP { 0 : 9 }\n LANGUAGE 0 {\n  TITLE "x"\n  SIZE_INFO { %s }\n }\n}\n' % nums + corpus.disc(1, cdtext=False), False
+
+def tracks(n):
+	return corpus.disc(n, seed=1), False
+
+def unterminated(n):
+	# No closing quote, with escaped quotes that every later attempt at a string could start from
+	return corpus.disc(1, cdtext=False) + 'FILE "' + '\\"' * n + '\n', True
+
+def lexerrors(n):
+	# A single line of characters that are not tokens
+	return corpus.disc(1, cdtext=False) + '@' * n + '\n', True
+
+def parseerrors(n):
+	# A single line of tokens in the wrong place
+	return corpus.disc(1, cdtext=False) + 'FILE { } 1 2 3 ' * n + '\n', True
+
+# Family name to (generator, size of the smallest input)
+_families = {
+	'huge string': (hugetext, 20000),
+	'LANGUAGE blocks': (languages, 500),
+	'INDEX lines': (indices, 2000),
+	'SIZE_INFO list': (sizeinfo, 20000),
+	'tracks': (tracks, 200),
+	'unterminated string': (unterminated, 5000),
+	'illegal characters': (lexerrors, 5000),
+	'parse errors': (parseerrors, 2000),
+}
+
+def scaling(args, fails):
+	"""
+	Parse time of each family at 1, 2, 4, and 8 times its base size must grow no faster than size^max_exponent.
+	"""
+	for name in sorted(_families):
+		gen, base = _families[name]
+		sizes = [int(base * args.scale) * (2 ** k) for k in range(4)]
+
+		times = []
+		lengths = []
+		for n in sizes:
+			txt, recover = gen(n)
+			lengths.append(len(txt))
+
+			try:
+				best = None
+				for rep in range(3):
+					toc, dt = capped(args.cap, loads, txt, recover)
+					if best is None or dt < best:
+						best = dt
+				times.append(best)
+			except Timeout:
+				fails.add('scaling', name, "%d characters over the %.1f s cap" % (len(txt), args.cap), txt)
+				break
+			except tocparser.TOCError as e:
+				fails.add('scaling', name, "%s: %s" % (type(e).__name__, e), txt)
+				break
+
+		if len(times) != len(sizes):
+			continue
+
+		# Slope of log(time) against log(input size) from the smallest to the largest input
+		exponent = math.log(times[-1] / times[0]) / math.log(lengths[-1] / lengths[0])
+		print("scaling: %-20s %9d chars %8.1f ms  ...  %9d chars %8.1f ms   exponent %.2f" % (name, lengths[0], times[0]*1000, lengths[-1], times[-1]*1000, exponent))
+		if exponent > args.max_exponent:
+			fails.add('scaling', name, "time grows as size^%.2f" % exponent)
+
+_checks = {
+	'examples': examples,
+	'roundtrip': roundtrip,
+	'mutate': mutations,
+	'scaling': scaling,
+}
+
+def main():
+	p = argparse.ArgumentParser()
+	p.add_argument('checks', nargs='*', help='Checks to run: %s (default: all)' % ', '.join(sorted(_checks)))
+	p.add_argument('--seed', type=int, default=0)
+	p.add_argument('--cases', type=int, default=500, help='Discs for roundtrip and mutate')
+	p.add_argument('--cap', type=float, default=5.0, help='Wall time cap of a single parse in seconds')
+	p.add_argument('--max-exponent', type=float, default=1.3, help='Largest acceptable growth of parse time with input size')
+	p.add_argument('--scale', type=float, default=1.0, help='Multiplier for the sizes of the scaling inputs')
+	p.add_argument('--save', metavar='DIR', help='Directory to save inputs that fail')
+	args = p.parse_args()
+
+	bad = [c for c in args.checks if c not in _checks]
+	if bad:
+		p.error("unknown check(s): %s" % ', '.join(bad))
+
+	signal.signal(signal.SIGALRM, _alarm)
+
+	fails = Failures(args.save)
+	for name in args.checks or sorted(_checks):
+		_checks[name](args, fails)
+
+	print("%d failure(s)" % fails.count)
+	return 1 if fails.count else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Start-up cost of a fresh interpreter: time to import tocparser (from python -X importtime) and to the end of the first parse.
+This is what short lived processes such as the command line tool pay on every run.
+
+	python3 bench/importtime.py [--runs N] [--tracks N] [--baseline DIR]
+
+Each measurement is a new process and the median of the runs is reported.
+With --baseline, the tocparser package in DIR (e.g., a git worktree of an older commit) is measured as well, interleaved with this one.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import corpus
+
+_here = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Run in the child: time the import and the first parse of the file in argv[1]
+_firstparse = '''
+import sys, time
+t0 = time.perf_counter()
+import tocparser
+t1 = time.perf_counter()
+tocparser.TOC.load(sys.argv[1])
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t0)
+'''
+
+def run(path, args):
+	"""
+	Runs python with @args and the package directory @path first on sys.path, returns (stdout, stderr).
+	"""
+	env = dict(os.environ)
+	env['PYTHONPATH'] = path
+	# Byte code caches are written as they would be for an installed package
+	env.pop('PYTHONDONTWRITEBYTECODE', None)
+	p = subprocess.run([sys.executable] + args, env=env, capture_output=True, text=True, check=True)
+	return p.stdout, p.stderr
+
+def importtime(path):
+	"""
+	Cumulative microseconds to import tocparser as reported by -X importtime.
+	"""
+	out, err = run(path, ['-X', 'importtime', '-c', 'import tocparser'])
+	for line in err.splitlines():
+		parts = line.split('|')
+		if len(parts) == 3 and parts[2].strip() == 'tocparser':
+			return int(parts[1])
+	raise RuntimeError("tocparser not found in -X importtime output")
+
+def firstparse(path, tocpath):
+	"""
+	Milliseconds to import tocparser and to finish the first TOC.load().
+	"""
+	out, err = run(path, ['-c', _firstparse, tocpath])
+	imp, total = out.split()
+	return float(imp) * 1000, float(total) * 1000
+
+def main():
+	p = argparse.ArgumentParser()
+	p.add_argument('--runs', type=int, default=20)
+	p.add_argument('--tracks', type=int, default=12)
+	p.add_argument('--baseline', help='Directory containing another tocparser package to compare against')
+	args = p.parse_args()
+
+	paths = [_here]
+	if args.baseline:
+		paths.append(os.path.abspath(args.baseline))
+
+	with tempfile.NamedTemporaryFile('w', suffix='.toc') as f:
+		f.write(corpus.disc(args.tracks, seed=1))
+		f.flush()
+
+		# Warm up: byte code caches, and any table files a version writes on first use
+		for path in paths:
+			firstparse(path, f.name)
+
+		imports = [[] for path in paths]
+		firsts = [[] for path in paths]
+		for i in range(args.runs):
+			for j,path in enumerate(paths):
+				imports[j].append(importtime(path) / 1000)
+				firsts[j].append(firstparse(path, f.name)[1])
+
+	for j,path in enumerate(paths):
+		name = 'baseline' if j else 'tocparser'
+		print("%10s: import %6.1f ms   import + first parse %6.1f ms" % (name, statistics.median(imports[j]), statistics.median(firsts[j])))
+
+if __name__ == '__main__':
+	main()
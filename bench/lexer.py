@@ -0,0 +1,48 @@
+"""
+Lexer throughput in tokens per second.
+Compares the PLY lexer (lexer()) against the standalone tokenize() generator.
+
+	python3 bench/lexer.py [TRACKS] [REPEAT]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tocparser.lex import lexer, tokenize
+
+import corpus
+
+def rate(func, txt, repeat):
+	"""
+	Returns (tokens, tokens per second) of the best of @repeat runs of @func over @txt.
+	"""
+	best = None
+	for i in range(repeat):
+		t0 = time.perf_counter()
+		n = 0
+		for tok in func(txt):
+			n += 1
+		dt = time.perf_counter() - t0
+		if best is None or dt < best:
+			best = dt
+
+	return n, n / best
+
+def main():
+	tracks = int(sys.argv[1]) if len(sys.argv) > 1 else 99
+	repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+	txt = corpus.disc(tracks)
+
+	n, ply = rate(lexer, txt, repeat)
+	n, fast = rate(tokenize, txt, repeat)
+
+	print("%d tracks, %d tokens, %d bytes" % (tracks, n, len(txt)))
+	print("     lexer(): %10.0f tokens/s" % ply)
+	print("  tokenize(): %10.0f tokens/s" % fast)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,78 @@
+"""
+Memory used per Track object.
+Compares the current Track against the previous dictionary-based layout (reproduced below) by parsing a number of
+discs and measuring the retained allocations with tracemalloc.
+
+	python3 bench/memory.py [DISCS] [TRACKS]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import tocparser
+from tocparser.lex import yaccer
+
+import corpus
+
+class DictTrack:
+	"""
+	Track as it was before __slots__: an instance dictionary, three MSF objects, and unshared strings.
+	"""
+
+	def __init__(self, p):
+		self._num = int(p['comment'].split(' ')[1])
+		self._copy = p['copy']
+		self._preemphasis = p['preemphasis']
+		self._channels = p['channels']
+		self._meta = {}
+		for entry in (p['text'] or []):
+			self._meta[ entry['langnum'] ] = dict(entry['opts'])
+		self._isrc = p['isrc']
+		seg = p['segments'][0]
+		self._filepath = seg['path']
+		self._filestart = tocparser.MSF.Create( seg['start'] )
+		self._fileduration = tocparser.MSF.Create( seg['length'] )
+		self._fileend = self._filestart + self._fileduration
+
+def measure(texts, build):
+	"""
+	Parses each of @texts, builds tracks with @build, and returns the bytes still allocated per track.
+	"""
+	keep = []
+	tracemalloc.start()
+	base = tracemalloc.get_traced_memory()[0]
+	for txt in texts:
+		p = yaccer(txt)
+		keep.append(build(p['tracks']))
+		del p
+	used = tracemalloc.get_traced_memory()[0] - base
+	tracemalloc.stop()
+
+	return used / sum(len(k) for k in keep)
+
+def main():
+	discs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+	tracks = int(sys.argv[2]) if len(sys.argv) > 2 else 99
+
+	texts = [corpus.disc(tracks, seed=i) for i in range(discs)]
+
+	# Warm up the parser so table generation is not counted
+	yaccer(texts[0])
+
+	def compact(ps):
+		strings = {}
+		return [tocparser.Track(p, strings) for p in ps]
+
+	before = measure(texts, lambda ps: [DictTrack(p) for p in ps])
+	after = measure(texts, compact)
+
+	print("%d discs x %d tracks" % (discs, tracks))
+	print("  before: %7.1f bytes/track" % before)
+	print("   after: %7.1f bytes/track" % after)
+	print("   ratio: %7.2f" % (after / before))
+
+if __name__ == '__main__':
+	main()
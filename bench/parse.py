@@ -0,0 +1,92 @@
+"""
+Parsing throughput of whole TOC files in tracks per second.
+Plain audio discs as written by cdrdao are the common case and should not get slower as the grammar grows;
+mixed-mode discs exercise data tracks and multiple segments.
+
+	python3 bench/parse.py [--discs N] [--tracks N] [--repeat N] [--baseline DIR]
+
+With --baseline, the tocparser package in DIR (e.g., a git worktree of an older commit) is timed as well,
+interleaved with this one so that both see the same machine conditions, and the ratio is reported.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import tocparser
+
+import corpus
+
+def mixed(ntracks, seed):
+	"""
+	Mixed-mode disc: a data track followed by audio tracks with pregaps, silence, and indices spread over two files.
+	"""
+	txt = corpus.disc(ntracks, seed=seed).replace('CD_DA', 'CD_ROM', 1)
+	txt = txt.replace('TWO_CHANNEL_AUDIO\n', 'TWO_CHANNEL_AUDIO\nPREGAP 00:02:00\n')
+	txt = txt.replace('FILE "data.wav"', 'SILENCE 00:02:00\nSTART\nFILE "data.wav"')
+	return txt.replace('// Track 1\n', '// Track 0\nTRACK MODE1\nDATAFILE "data.bin" #0 00:10:00\n\n// Track 1\n', 1)
+
+def loadbaseline(path):
+	"""
+	Imports the tocparser package found in directory @path under another name.
+	"""
+	init = os.path.join(path, 'tocparser', '__init__.py')
+	spec = importlib.util.spec_from_file_location('tocparser_baseline', init, submodule_search_locations=[os.path.dirname(init)])
+	m = importlib.util.module_from_spec(spec)
+	sys.modules[spec.name] = m
+	spec.loader.exec_module(m)
+	return m
+
+def rates(mods, texts, repeat):
+	"""
+	Returns tracks per second of each module in @mods, the best of @repeat interleaved passes over @texts.
+	"""
+	best = [None] * len(mods)
+	for i in range(repeat):
+		for j,m in enumerate(mods):
+			t0 = time.process_time()
+			n = 0
+			for txt in texts:
+				n += len(m.TOC.loads(txt).Tracks)
+			dt = time.process_time() - t0
+			if best[j] is None or dt < best[j]:
+				best[j] = dt
+
+	return [n / b for b in best]
+
+def main():
+	p = argparse.ArgumentParser()
+	p.add_argument('--discs', type=int, default=10)
+	p.add_argument('--tracks', type=int, default=99)
+	p.add_argument('--repeat', type=int, default=20)
+	p.add_argument('--baseline', help='Directory containing another tocparser package to compare against')
+	args = p.parse_args()
+
+	audio = [corpus.disc(args.tracks, seed=i).encode() for i in range(args.discs)]
+	mixedmode = [mixed(args.tracks, i).encode() for i in range(args.discs)]
+
+	mods = [tocparser]
+	if args.baseline:
+		mods.append(loadbaseline(args.baseline))
+
+	# Warm up the parsers so table generation is not counted
+	for m in mods:
+		m.TOC.loads(audio[0])
+
+	print("%d discs x %d tracks" % (args.discs, args.tracks))
+
+	r = rates(mods, audio, args.repeat)
+	print("   plain audio: %8.0f tracks/s" % r[0])
+	if args.baseline:
+		print("      baseline: %8.0f tracks/s (ratio %.3f)" % (r[1], r[0]/r[1]))
+
+	# The baseline may not understand mixed mode
+	r = rates(mods[:1], mixedmode, args.repeat)
+	print("    mixed mode: %8.0f tracks/s" % r[0])
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,52 @@
+"""
+Parsing throughput with error recovery.
+Parses the same discs cleanly and with a fraction of their tracks broken (FILE line removed) using recover=True.
+
+	python3 bench/recover.py [DISCS] [TRACKS] [ERROR_RATE]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import tocparser
+
+import corpus
+
+def breaktracks(txt, rate, seed=0):
+	"""
+	Removes the FILE line of each track with probability @rate.
+	"""
+	r = random.Random(seed)
+	return '\n'.join(l for l in txt.split('\n') if not (l.startswith('FILE ') and r.random() < rate))
+
+def rate(texts, recover):
+	"""
+	Returns kilobytes of input parsed per second over @texts.
+	"""
+	t0 = time.perf_counter()
+	for txt in texts:
+		tocparser.TOC.loads(txt, recover=recover)
+	return sum(len(txt) for txt in texts) / 1024 / (time.perf_counter() - t0)
+
+def main():
+	discs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+	tracks = int(sys.argv[2]) if len(sys.argv) > 2 else 99
+	errors = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+	clean = [corpus.disc(tracks, seed=i).encode() for i in range(discs)]
+	broken = [breaktracks(corpus.disc(tracks, seed=i), errors, seed=i).encode() for i in range(discs)]
+
+	# Warm up the parser so table generation is not counted
+	tocparser.TOC.loads(clean[0])
+
+	print("%d discs x %d tracks, %.0f%% of tracks broken" % (discs, tracks, errors*100))
+	print("             clean: %8.0f KB/s" % rate(clean, False))
+	print("     clean recover: %8.0f KB/s" % rate(clean, True))
+	print("    broken recover: %8.0f KB/s" % rate(broken, True))
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,85 @@
+"""
+Cost of watching a spool directory with tocparser.watch(): initial ingestion, CPU used while the tree is idle,
+and the delay from a file being written to its batch being delivered, for inotify and for polling.
+
+	python3 bench/watch.py [--files N] [--dirs N] [--idle SECONDS] [--jobs N]
+
+Idle CPU is that of this process (the watcher thread) over --idle seconds with nothing changing.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import tocparser
+
+import corpus
+
+def populate(root, nfiles, ndirs):
+	"""
+	Writes @nfiles small TOC files spread over @ndirs directories under @root.
+	"""
+	txt = corpus.disc(3, seed=1)
+	for i in range(nfiles):
+		d = os.path.join(root, "d%03d" % (i % ndirs))
+		if i < ndirs:
+			os.makedirs(d)
+		with open(os.path.join(d, "%06d.toc" % i), 'w') as f:
+			f.write(txt)
+
+def measure(root, inotify, args):
+	batches = []
+	got = threading.Event()
+
+	def callback(events):
+		batches.append( (time.perf_counter(), len(events)) )
+		got.set()
+
+	t0 = time.perf_counter()
+	w = tocparser.watch(root, callback, debounce=0.2, interval=args.interval, jobs=args.jobs, inotify=inotify)
+	got.wait()
+	ingest = time.perf_counter() - t0
+	got.clear()
+
+	c0 = time.process_time()
+	time.sleep(args.idle)
+	idle = time.process_time() - c0
+
+	path = os.path.join(root, 'd000', 'new.toc')
+	t0 = time.perf_counter()
+	with open(path, 'w') as f:
+		f.write(corpus.disc(5, seed=2))
+	got.wait(60)
+	latency = batches[-1][0] - t0
+
+	os.remove(path)
+	w.Stop()
+
+	name = 'inotify' if inotify else 'polling'
+	print("%8s: ingest %7.2f s (%d files)  idle CPU %5.1f%%  change latency %6.3f s" % (name, ingest, batches[0][1], 100 * idle / args.idle, latency))
+
+def main():
+	p = argparse.ArgumentParser()
+	p.add_argument('--files', type=int, default=10000)
+	p.add_argument('--dirs', type=int, default=100)
+	p.add_argument('--idle', type=float, default=10.0)
+	p.add_argument('--interval', type=float, default=5.0, help='Polling interval in seconds')
+	p.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+	args = p.parse_args()
+
+	root = tempfile.mkdtemp()
+	try:
+		populate(root, args.files, args.dirs)
+		measure(root, True, args)
+		measure(root, False, args)
+	finally:
+		shutil.rmtree(root)
+
+if __name__ == '__main__':
+	main()
@@ -11,6 +11,7 @@ setup(
 	author_email = "cmlburnett@gmail.com",
 	url = "",
 	packages = ['tocparser'],
+	scripts = ['bin/tocparser'],
 	package_data = {'tocparser': ['tocparser/__init__.py', 'tocparser/lex.py']},
 	classifiers = [
 		'Programming Language :: Python :: 3.4'
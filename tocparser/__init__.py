@@ -3,9 +3,15 @@ TOC file parser as produced by cdrdao.
 The TOC can contain metadata in addition to the track listing and times.
 """
 
-__all__ = ['TOC', 'MSF', 'LangCodeToName', 'LangCodeTo2Letter', 'version']
+__all__ = ['TOC', 'Track', 'Segment', 'MSF', 'TOCError', 'LexError', 'ParseError', 'LangCodeToName', 'LangCodeTo2Letter', 'diff', 'watch', 'version']
 
-from .lex import lexer, yaccer
+import hashlib
+import sys
+
+from .lex import lexer, yaccer, tokenize, TOCError, LexError, ParseError, _Escaped
+
+# Names from the diff module, imported on first use by __getattr__() as parsing does not need them
+_diffnames = ('diff', 'Change', 'TrackAdded', 'TrackRemoved', 'TrackMoved', 'TrackResized', 'TrackMetaChanged', 'HeaderChanged')
 
 class MSF:
 	"""
@@ -13,6 +19,8 @@ class MSF:
 	There are 75 frames per second.
 	"""
 
+	__slots__ = ('m', 's', 'f')
+
 	def __init__(self, m,s,f):
 		"""
 		Supply minutes, seconds, and frames.
@@ -111,52 +119,89 @@ class TOC:
 	"""
 
 	def __init__(self):
-		pass
+		self._catalog = None
+		self._type = None
+		self._digest = None
+		self._header = None
+		self._tracks = []
+		self._diagnostics = []
 
 	@staticmethod
-	def load(path):
+	def load(path, recover=False):
 		"""
 		Load from file.
+		See parse() for @recover.
 		"""
 		with open(path, 'rb') as f:
 			dat = f.read()
-			return TOC.loads(dat)
+			return TOC.loads(dat, recover=recover)
 	
 	@staticmethod
-	def loads(txt, encoding='latin-1'):
+	def loads(txt, encoding='latin-1', recover=False):
 		"""
 		Load from string.
+		See parse() for @recover.
 		"""
 		t = TOC()
-		t.parse(txt.decode(encoding))
+		t.parse(txt.decode(encoding), recover=recover)
+		t._digest = hashlib.sha1(txt).hexdigest()
 
 		return t
 
 
-	def parse(self, txt):
+	def parse(self, txt, recover=False):
 		"""
 		Parse the text @txt and populate this object with the parsed information.
+		Errors raise a LexError or ParseError unless @recover is True, in which case broken tracks are skipped,
+		whatever could be parsed is kept, and the errors are available in Diagnostics.
 		"""
 
+		# Whatever this was loaded from before, it is not what it holds now
+		self._digest = None
+
 		# Lex & Yacc out the structure
-		p = yaccer(txt)
+		if recover:
+			self._diagnostics = []
+			p = yaccer(txt, diagnostics=self._diagnostics)
+			if p is None:
+				return
+		else:
+			p = yaccer(txt)
 
 		# Get the catalog string
 		if p['catalog'] != None:
 			self._catalog = p['catalog']
 
+		self._type = p['type']
+
+		# Repeated strings (paths, performers, etc.) are shared across the disc
+		strings = {}
+
 		# Get the header information
 		if p['header'] != None:
-			h = Header(p['header'])
+			h = Header(p['header'], strings)
+			encodings = h.Encodings
+			declared = h._declared
 		else:
 			h = None
+			encodings = {}
+			declared = ()
 		ts = []
 
-		# Iterate through the tracks
+		# Iterate through the tracks, numbering from the previous one if the comment is missing,
+		# and placing each one on the disc after the previous one
+		num = 0
+		offset = 0
 		for track in p['tracks']:
-			t = Track(track)
+			t = Track(track, strings, num + 1, offset, encodings, declared)
+			num = t.Number
 			ts.append(t)
 
+			# Once a track runs to the end of its file nothing after it has a known place on the disc
+			if offset is not None:
+				length = t._discframes()
+				offset = offset + length if length is not None else None
+
 		# Assign to this object
 		self._header = h
 		self._tracks = ts
@@ -168,6 +213,28 @@ class TOC:
 		"""
 		return self._catalog
 
+	@property
+	def Diagnostics(self):
+		"""
+		List of TOCError (LexError or ParseError) encountered when parsed with recover=True.
+		"""
+		return self._diagnostics
+
+	@property
+	def Type(self):
+		"""
+		Type of disc: CD_DA, CD_ROM, CD_ROM_XA, or CD_I.
+		"""
+		return self._type
+
+	@property
+	def Digest(self):
+		"""
+		SHA-1 hex digest of the raw bytes this TOC was loaded from, or None if parsed from a string.
+		Two TOC objects with the same digest are identical.
+		"""
+		return self._digest
+
 	@property
 	def Header(self):
 		"""
@@ -192,17 +259,76 @@ class TOC:
 
 		return None
 
+	def SegmentPlan(self):
+		"""
+		Gets the byte and sample ranges to read from each file to extract the tracks.
+		Returns a dictionary of file path to an array('q') of rows of five integers, flattened:
+
+			track number, byte start, byte length, sample start, sample length
+
+		Rows are in disc order, and consecutive segments of a track that are contiguous in the same file are merged
+		into one row so each track can be copied with one sequential read (or os.sendfile/os.copy_file_range).
+		Values are exact, from the samples and bytes in the TOC rather than rounded to frames (see Segment.Bytes and
+		Segment.Samples). Bytes count from the start of the audio data (after any WAV header) and include the # offset;
+		a frame is 2352 bytes and 588 samples for audio, plus 96 bytes with sub-channel data.
+		Lengths are -1 if the segment runs to the end of the file, and samples are -1 for data tracks.
+		"""
+		import array
+
+		plan = {}
+
+		for t in self._tracks:
+			# Rows of the file the previous segment of this track was read from, None after silence, zeros, or a FIFO
+			prev = None
+
+			for seg in t.Segments:
+				if seg._filepath is None or seg._kind == 'fifo':
+					prev = None
+					continue
+
+				bstart, blen = seg.Bytes
+				if blen is None:
+					blen = -1
+
+				samples = seg.Samples
+				if samples is not None:
+					sstart, slen = samples
+					if slen is None:
+						slen = -1
+				else:
+					sstart = -1
+					slen = -1
+
+				rows = plan.get(seg._filepath)
+				if rows is None:
+					rows = plan[seg._filepath] = array.array('q')
+
+				# Merge with the row of the previous segment of the track if this one continues it in the same file
+				if prev is rows and rows[-3] != -1 and rows[-4] + rows[-3] == bstart:
+					rows[-3] = rows[-3] + blen if blen != -1 else -1
+					if sstart != -1:
+						rows[-1] = rows[-1] + slen if slen != -1 else -1
+				else:
+					rows.extend( (t._num, bstart, blen, sstart, slen) )
+
+				prev = rows
+
+		return plan
+
 	@property
 	def TotalLength(self):
 		"""
-		Gets the total length of the CD by adding the durations of all the tracks.
+		Gets the total length of the CD by adding the lengths of all the tracks.
+		None if the length of a track is not known (a segment without a length runs to the end of its file).
 		"""
-		z = MSF.Zero()
-
-		for t in self.Tracks:
-			z = z + t.FileDuration
+		total = 0
+		for t in self._tracks:
+			length = t._discframes()
+			if length is None:
+				return None
+			total += length
 
-		return z
+		return MSF(0,0,total)
 
 class Header:
 	"""
@@ -213,19 +339,30 @@ class Header:
 	_langmap = None
 	_meta = None
 
-	def __init__(self, p):
+	def __init__(self, p, strings=None):
 		self._langmap = {}
-		self._meta = {}
+		self._encodings = {}
+		self._declared = set()
 
 		for entry in p['map']:
 			self._langmap[ entry[0] ] = (entry[1], LangCodeTo2Letter(entry[1]), LangCodeToName(entry[1]))
 
+		# Character set of each language block: from the first SIZE_INFO byte, else guessed from the language
 		for entry in p['langs']:
-			os = {}
+			code = None
 			for o in entry['opts']:
-				os[ o[0] ] = o[1]
+				if o[0] == 'sizeinfo' and len(o[1]):
+					code = o[1][0]
+
+			langnum = entry['langnum']
+			if code in _charsets:
+				self._encodings[langnum] = _charsets[code]
+				self._declared.add(langnum)
+			else:
+				lang = self._langmap.get(langnum, (None,))[0]
+				self._encodings[langnum] = _langcharsets.get(lang, 'latin-1')
 
-			self._meta[ entry['langnum'] ] = os
+		self._meta = _metadict(p['langs'], strings if strings is not None else {}, self._encodings, self._declared)
 
 	@property
 	def LangMap(self):
@@ -245,47 +382,88 @@ class Header:
 		"""
 		return self._meta
 
+	@property
+	def Encodings(self):
+		"""
+		Python codec used to decode the CD-TEXT of each language, keyed on the language map index.
+		"""
+		return self._encodings
+
 class Track:
 	"""
 	Represents a track.
 	"""
 
-	_num = None
-	_copy = None
-	_preemphasis = None
-	_channels = None
-	_isrc = None
-	_meta = None
-	_filepath = None
-	_filestart = None
-	_fileend = None
-	_fileduration = None
+	# Millions of these may be held in memory so keep them small: no instance dictionary, times as integers,
+	# a track of a single FILE in _filepath, _start, and _length rather than a Segment (_segments is then None),
+	# and strings shared across the disc via the @strings pool.
+	__slots__ = ('_num', '_mode', '_subchannel', '_copy', '_preemphasis', '_channels', '_isrc', '_meta', '_filepath', '_start', '_length', '_segments', '_disc', '_pregap', '_indices')
 
-	def __init__(self, p):
-		parts = p['comment'].split(' ')
-		if len(parts) == 2 and parts[0].lower() == 'track':
-			self._num = int(parts[1])
+	def __init__(self, p, strings=None, num=None, offset=0, encodings=None, declared=()):
+		"""
+		Create from the parsed track dictionary @p.
+		@strings is an optional dictionary used to de-duplicate equal strings (paths, performers, etc.) across tracks.
+		@num is the track number to use if the "// Track N" comment is missing.
+		@offset is the frame on the disc where this track (including its pregap) begins, or None if that is not known.
+		@encodings is Header.Encodings, used to decode CD-TEXT, and @declared the languages whose character set is given by SIZE_INFO.
+		"""
+		if strings is None:
+			strings = {}
+
+		self._num = num
+		if p['comment'] is not None:
+			parts = p['comment'].split(' ')
+			if len(parts) == 2 and parts[0].lower() == 'track' and parts[1].isdigit():
+				self._num = int(parts[1])
 
+		self._mode = strings.setdefault(p['mode'], p['mode'])
+		self._subchannel = p['subchannel']
 		self._copy = p['copy']
 		self._preemphasis = p['preemphasis']
 		self._channels = p['channels']
-		self._meta = {}
-
-		if p['text'] != None:
-			for entry in p['text']:
-				os = {}
-				for o in entry['opts']:
-					os[ o[0] ] = o[1]
-
-				self._meta[ entry['langnum'] ] = os
-
+		self._meta = _metadict(p['text'], strings, encodings, declared)
 		self._isrc = p['isrc']
-		self._filepath = p['path']['path']
 
-		# Start and duration are given, add them to get the end
-		self._filestart = MSF.Create( p['path']['times'][0] )
-		self._fileduration = MSF.Create( p['path']['times'][1] )
-		self._fileend = self._filestart + self._fileduration
+		unit = self._unit()
+		segs = p['segments']
+		if len(segs) == 1 and p['pregap'] is None and segs[0]['kind'] == 'file' and segs[0]['offset'] == 0:
+			# Nearly every track is a single FILE: keep it in the track and only make its Segment when asked for
+			seg = segs[0]
+			path = _decode(seg['path'], 'latin-1')
+			self._filepath = strings.setdefault(path, path)
+			self._start = _units(seg['start'], unit)
+			self._length = _units(seg['length'], unit) if seg['length'] is not None else None
+			self._segments = None
+		else:
+			segs = [_segment(seg, self._mode, self._subchannel, strings) for seg in segs]
+
+			# PREGAP is the same as SILENCE followed by START
+			if p['pregap'] is not None:
+				segs.insert(0, Segment('silence', None, 0, 0, MSF.Create(p['pregap']).TotalFrames * unit, self._mode, self._subchannel))
+
+			self._filepath = None
+			self._start = None
+			self._length = None
+			self._segments = tuple(segs)
+
+		pregap = 0
+		if p['pregap'] is not None:
+			pregap = MSF.Create(p['pregap']).TotalFrames
+
+		# START gives the pregap length, or without a time it is the length of the segments before it
+		if p['start'] is not None:
+			val, n = p['start']
+			if val is not None:
+				pregap = MSF.Create(val).TotalFrames
+			else:
+				segs = self.Segments
+				span = _span(segs[len(segs) - len(p['segments']):][:n], unit)
+				pregap = pregap + span // unit if span is not None else None
+
+		# Disc frame of index 0, the length of the pregap up to index 1, and each INDEX relative to index 1
+		self._disc = offset
+		self._pregap = pregap
+		self._indices = tuple(MSF.Create(i).TotalFrames for i in p['indices'])
 
 	@property
 	def Number(self):
@@ -294,6 +472,20 @@ class Track:
 		"""
 		return self._num
 
+	@property
+	def Mode(self):
+		"""
+		Track mode: AUDIO, MODE1, MODE2_FORM1, etc.
+		"""
+		return self._mode
+
+	@property
+	def SubChannelMode(self):
+		"""
+		Sub-channel data stored with the track (RW or RW_RAW) or None.
+		"""
+		return self._subchannel
+
 	@property
 	def Copy(self):
 		"""
@@ -311,7 +503,7 @@ class Track:
 	@property
 	def Channels(self):
 		"""
-		Number of channels (always 2 for CDs).
+		Number of channels (2 or 4 for audio, None for data tracks).
 		"""
 		return self._channels
 
@@ -329,34 +521,449 @@ class Track:
 		"""
 		return self._meta
 
+	@property
+	def Segments(self):
+		"""
+		Tuple of Segment that make up the data of this track, in order.
+		"""
+		if self._segments is None:
+			return (Segment('file', self._filepath, 0, self._start, self._length, self._mode, self._subchannel),)
+		return self._segments
+
+	def _firstfile(self):
+		"""
+		Gets the first segment that references a file, or None.
+		"""
+		for seg in self.Segments:
+			if seg._filepath is not None:
+				return seg
+		return None
+
+	def _filerange(self):
+		"""
+		Start and end in frames of the data in FilePath: the first file segment and any that directly continue it in the same file.
+		Both are rounded down to whole frames so that tracks cut one after the other from a file do not overlap.
+		The end is None if the data runs to the end of the file.
+		"""
+		if self._segments is None:
+			unit = self._unit()
+			return self._start // unit, (self._start + self._length) // unit if self._length is not None else None
+
+		first = self._firstfile()
+		if first is None:
+			return 0, 0
+
+		unit = first._unit()
+		start = first._start
+		end = start + first._length if first._length is not None else None
+		for seg in self._segments[self._segments.index(first) + 1:]:
+			if end is None or seg._filepath != first._filepath or seg._offset != first._offset or seg._unit() != unit or seg._start != end:
+				break
+			end = end + seg._length if seg._length is not None else None
+
+		return start // unit, end // unit if end is not None else None
+
+	def _unit(self):
+		"""
+		Samples (audio) or bytes (data) per frame of the track.
+		"""
+		if self._mode == 'AUDIO':
+			return 588
+		return _sectorsize(self._mode, self._subchannel)
+
+	def _discframes(self):
+		"""
+		Frames the track takes on the disc, pregap included.
+		A partial frame at the end counts as a whole one, as cdrdao pads it. None if a segment runs to the end of its file.
+		"""
+		unit = self._unit()
+		span = self._length if self._segments is None else _span(self._segments, unit)
+		if span is None:
+			return None
+		return -(-span // unit)
+
 	@property
 	def FilePath(self):
 		"""
-		Path to the file where this track is located
+		Path to the file where this track is located (the first file if the track has several segments).
 		"""
-		return self._filepath
+		if self._segments is None:
+			return self._filepath
+
+		seg = self._firstfile()
+		return seg._filepath if seg is not None else None
 
 	@property
 	def FileStart(self):
 		"""
-		Start time of this track in MSF format.
+		Start time of this track within FilePath in MSF format.
 		"""
-		return self._filestart
+		return MSF(0,0,self._filerange()[0])
 
 	@property
 	def FileEnd(self):
 		"""
-		End time of this track in MSF format.
+		End time of this track within FilePath in MSF format.
+		Only the data read from FilePath counts: not a PREGAP or SILENCE before it, nor segments in other files after it.
+		None if the track runs to the end of the file, as the length of the file is not known.
 		"""
-		return self._fileend
+		end = self._filerange()[1]
+		if end is None:
+			return None
+		return MSF(0,0,end)
 
 	@property
 	def FileDuration(self):
 		"""
-		Duration of this track in MSF format.
+		Duration of the data of this track in FilePath in MSF format, which is FileEnd less FileStart.
+		See Length for the duration of the whole track on the disc. None if the track runs to the end of the file.
 		"""
-		return self._fileduration
+		start, end = self._filerange()
+		if end is None:
+			return None
+		return MSF(0,0,end - start)
 
+	@property
+	def Length(self):
+		"""
+		Length of the track on the disc in MSF format: all segments, including the pregap and any SILENCE or ZERO.
+		None if a segment has no length and so runs to the end of its file.
+		"""
+		length = self._discframes()
+		if length is None:
+			return None
+		return MSF(0,0,length)
+
+	@property
+	def Pregap(self):
+		"""
+		Length of the pregap (index 0) in MSF format, zero if there is none.
+		The pregap is part of the track data and of Length.
+		None if a bare START follows a segment that runs to the end of its file.
+		"""
+		if self._pregap is None:
+			return None
+		return MSF(0,0,self._pregap)
+
+	@property
+	def Indices(self):
+		"""
+		List of the INDEX positions (index 2 and up) in MSF format, relative to the track start (index 1) as in the TOC file.
+		"""
+		return [MSF(0,0,i) for i in self._indices]
+
+	@property
+	def DiscStart(self):
+		"""
+		Start of the track (index 1) on the disc in MSF format, counting from the start of the first track.
+		None if not known; see IndexOffsets.
+		"""
+		offs = self.IndexOffsets
+		if offs is None:
+			return None
+		return MSF(0,0,offs[1])
+
+	@property
+	def IndexOffsets(self):
+		"""
+		Tuple of absolute disc frames for each index: [0] is the start of the pregap, [1] the start of the track,
+		and [2] onwards each INDEX. [0] and [1] are equal if there is no pregap.
+		The place of the track on the disc is worked out once when the TOC is parsed so that splitting does not need to
+		add up the tracks before.
+		None if an earlier track has a segment without a length (it runs to the end of its file, whose length is not
+		known), as then neither is where this track starts; the tracks up to and including that one have offsets.
+		"""
+		if self._disc is None or self._pregap is None:
+			return None
+
+		start = self._disc + self._pregap
+		return (self._disc, start) + tuple(start + i for i in self._indices)
+
+
+class Segment:
+	"""
+	Part of the data of a track: a range of an audio or data file, silence, or zeros.
+	"""
+
+	__slots__ = ('_kind', '_filepath', '_offset', '_start', '_length', '_mode', '_subchannel')
+
+	def __init__(self, kind, filepath, offset, start, length, mode, subchannel):
+		"""
+		Create a segment of @kind reading from @filepath (None for silence and zero) after @offset bytes.
+		@start and @length (None to the end of the file) are samples for audio and bytes for data and DATAFILE, not
+		rounded to frames. @mode and @subchannel are those of the data, which are the track's except for ZERO.
+		"""
+		self._kind = kind
+		self._filepath = filepath
+		self._offset = offset
+		self._start = start
+		self._length = length
+		self._mode = mode
+		self._subchannel = subchannel
+
+	def __repr__(self):
+		return "<Segment kind=%s path=%s offset=%d start=%s length=%s>" % (self._kind, self._filepath, self._offset, self.Start, self.Length)
+
+	def _unit(self):
+		"""
+		Number of samples (audio) or bytes (data) per frame that _start and _length count in.
+		"""
+		return _segunit(self._kind, self._mode, self._subchannel)
+
+	def _frames(self):
+		"""
+		Start and length in whole frames.
+		Both ends are rounded down so that the frames of segments that follow each other in a file do not overlap.
+		"""
+		unit = self._unit()
+		start = self._start // unit
+		if self._length is None:
+			return start, None
+		return start, (self._start + self._length) // unit - start
+
+	@property
+	def Kind(self):
+		"""
+		One of 'file' (FILE or AUDIOFILE), 'datafile', 'fifo', 'silence', or 'zero'.
+		"""
+		return self._kind
+
+	@property
+	def Mode(self):
+		"""
+		Track mode of the data in this segment, same as the track unless given for ZERO.
+		"""
+		return self._mode
+
+	@property
+	def SubChannelMode(self):
+		"""
+		Sub-channel data stored with this segment (RW or RW_RAW) or None, same as the track unless given for ZERO.
+		"""
+		return self._subchannel
+
+	@property
+	def FilePath(self):
+		"""
+		Path of the file (or FIFO) the data is read from, None for silence and zero.
+		"""
+		return self._filepath
+
+	@property
+	def Offset(self):
+		"""
+		Byte offset into the file given with #, zero if not given.
+		"""
+		return self._offset
+
+	@property
+	def Start(self):
+		"""
+		Start time within the file in MSF format (after Offset), rounded down to a whole frame.
+		"""
+		return MSF(0,0,self._frames()[0])
+
+	@property
+	def Length(self):
+		"""
+		Length in MSF format or None if the segment runs to the end of the file.
+		Counted from the frame Start is in to the frame the segment ends in, so it can be a frame more or less than the
+		exact length when that is not a whole number of frames; see Samples and Bytes for the exact values.
+		"""
+		length = self._frames()[1]
+		if length is None:
+			return None
+		return MSF(0,0,length)
+
+	@property
+	def Samples(self):
+		"""
+		Exact (start, length) in samples of an audio segment, or None for data.
+		The length is None if the segment runs to the end of the file.
+		"""
+		if self._mode != 'AUDIO':
+			return None
+
+		unit = self._unit()
+		if unit == 588:
+			return self._start, self._length
+		return self._start * 588 // unit, self._length * 588 // unit if self._length is not None else None
+
+	@property
+	def Bytes(self):
+		"""
+		Exact (start, length) in bytes, counted from the start of the data in the file (after any WAV header) and including Offset.
+		The length is None if the segment runs to the end of the file.
+		"""
+		size = _sectorsize(self._mode, self._subchannel)
+		unit = self._unit()
+		if unit == size:
+			return self._offset + self._start, self._length
+		return self._offset + self._start * size // unit, self._length * size // unit if self._length is not None else None
+
+def watch(root, callback, **kwargs):
+	"""
+	Watches the directory tree at @root for TOC files that are added, changed, or removed and calls @callback with a
+	list of watcher.FileEvent for each batch. Runs on a background thread; returns the watcher.Watcher, call its Stop() when done.
+	See watcher.Watcher for the keyword arguments (manifest file, debounce, polling interval, worker processes).
+	"""
+	# Imported here as it pulls in multiprocessing and friends that parsing does not need
+	from .watcher import Watcher
+	return Watcher(root, callback, **kwargs).Start()
+
+def __getattr__(name):
+	"""
+	Imports diff() and the Change classes the first time one of them is looked up on the package.
+	Importing tocparser.diff directly before that leaves the package's diff attribute as the module, so use these names.
+	"""
+	if name not in _diffnames:
+		raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+	import importlib
+	mod = importlib.import_module('.diff', __name__)
+
+	# Importing the module sets the package's diff attribute to it, so bind the names after
+	g = globals()
+	for n in _diffnames:
+		g[n] = getattr(mod, n)
+	return g[name]
+
+def _segment(p, mode, subchannel, strings):
+	"""
+	Creates a Segment from the parsed segment dictionary @p of a track in @mode.
+	Times are converted to samples or bytes, and the path is de-duplicated through the @strings dictionary.
+	"""
+	path = None
+	if p['path'] is not None:
+		path = _decode(p['path'], 'latin-1')
+		path = strings.setdefault(path, path)
+
+	# ZERO can specify its own mode
+	mode = p.get('mode', mode)
+	if p.get('subchannel') is not None:
+		subchannel = p['subchannel']
+
+	unit = _segunit(p['kind'], mode, subchannel)
+	length = _units(p['length'], unit) if p['length'] is not None else None
+	return Segment(p['kind'], path, p['offset'], _units(p['start'], unit), length, mode, subchannel)
+
+def _segunit(kind, mode, subchannel):
+	"""
+	Number of samples (audio) or bytes (data) per frame that a segment of @kind in @mode counts in.
+	DATAFILE always counts bytes, even in an audio track.
+	"""
+	if mode == 'AUDIO' and kind != 'datafile':
+		return 588
+	return _sectorsize(mode, subchannel)
+
+def _units(val, unit):
+	"""
+	Converts a time from the parser to a number of samples or bytes: "MM:SS:FF" strings are frames of @unit each,
+	numbers are already samples or bytes.
+	"""
+	if type(val) == str:
+		return MSF.Create(val).TotalFrames * unit
+	return val
+
+def _span(segs, unit):
+	"""
+	Total length of the segments @segs in a track of @unit samples or bytes per frame, counted in that unit.
+	None if a segment has no length.
+	"""
+	total = 0
+	for seg in segs:
+		if seg._length is None:
+			return None
+		u = seg._unit()
+		total += seg._length if u == unit else seg._length * unit // u
+	return total
+
+def _sectorsize(mode, subchannel):
+	"""
+	Bytes per frame of a track in @mode, with sub-channel data if @subchannel is not None.
+	"""
+	return _blocksizes[mode] + (96 if subchannel is not None else 0)
+
+# Bytes per sector of each track mode
+_blocksizes = {
+	'AUDIO': 2352,
+	'MODE0': 2336,
+	'MODE1': 2048,
+	'MODE1_RAW': 2352,
+	'MODE2': 2336,
+	'MODE2_FORM1': 2048,
+	'MODE2_FORM2': 2324,
+	'MODE2_FORM_MIX': 2332,
+	'MODE2_RAW': 2352,
+}
+
+def _metadict(langs, strings, encodings=None, declared=()):
+	"""
+	Converts parsed CD-TEXT language blocks @langs to a dictionary keyed on language index to dictionaries of field to value.
+	String values are decoded with the codec for their language in @encodings (latin-1 if not given), which is taken
+	as is for the languages in @declared (see _decode()).
+	Keys are interned and string values are de-duplicated through the @strings dictionary.
+	"""
+	ret = {}
+	if langs is None:
+		return ret
+
+	for entry in langs:
+		codec = encodings.get(entry['langnum'], 'latin-1') if encodings else 'latin-1'
+		guess = entry['langnum'] not in declared
+
+		os = {}
+		for o in entry['opts']:
+			v = o[1]
+			if isinstance(v, str):
+				v = _decode(v, codec, guess)
+				v = strings.setdefault(v, v)
+			os[ sys.intern(o[0]) ] = v
+
+		ret[ entry['langnum'] ] = os
+
+	return ret
+
+def _decode(v, codec, guess=True):
+	"""
+	Decodes the parsed string @v, whose characters 0-255 stand for bytes, with @codec.
+	ASCII is returned as is. If @guess is set (no character set was declared) then raw bytes that are valid UTF-8 are
+	taken as UTF-8 rather than latin-1, as from a hand edited TOC file; escaped bytes, as cdrdao writes them, never are.
+	"""
+	if v.isascii():
+		return v
+
+	try:
+		b = v.encode('latin-1')
+	except UnicodeEncodeError:
+		# Already decoded (e.g., TOC.loads() given an encoding other than latin-1)
+		return v
+
+	if codec == 'latin-1':
+		if guess and type(v) is not _Escaped:
+			try:
+				return b.decode('utf-8')
+			except UnicodeDecodeError:
+				pass
+		return b.decode('latin-1')
+
+	return b.decode(codec, 'replace')
+
+# CD-TEXT character codes (first byte of SIZE_INFO) to Python codecs
+_charsets = {
+	0x00: 'latin-1',
+	0x01: 'ascii',
+	0x80: 'cp932',
+	0x81: 'cp949',
+	0x82: 'gbk',
+}
+
+# Character set guessed from the language code when there is no SIZE_INFO
+_langcharsets = {
+	101: 'cp949',
+	105: 'cp932',
+	117: 'gbk',
+}
 
 def LangCodeToName(idx):
 	"""
@@ -380,110 +987,110 @@ def LangCodeTo2Letter(idx):
 # Table 1.3 from https://www.gnu.org/software/libcdio/cd-text-format.html
 # https://en.wikipedia.org/wiki/ISO_3166-1_alpha-2
 # combined with the ISO 3166-1 alpha-2 codes
-_langcodes = {}
-_langcodes[0]  = ('??', 'Unknown')
-_langcodes[1]  = ('AL', 'Albania')
-_langcodes[2]  = ('', 'Breton')
-_langcodes[3]  = ('', 'Catalan')
-_langcodes[4]  = ('HR', 'Croatian')
-_langcodes[5]  = ('', 'Welsh')
-_langcodes[6]  = ('CZ', 'Czech')
-_langcodes[7]  = ('DK', 'Danish')
-_langcodes[8]  = ('DE', 'German')
-_langcodes[9]  = ('EN', 'English')
-_langcodes[10] = ('ES', 'Spanish')
-_langcodes[11] = ('', 'Esperanto')
-_langcodes[12] = ('EE', 'Estonian')
-_langcodes[13] = ('', 'Basque')
-_langcodes[14] = ('FO', 'Faroese')
-_langcodes[15] = ('FR', 'French')
-_langcodes[16] = ('', 'Frisian')
-_langcodes[17] = ('', 'Irish')
-_langcodes[18] = ('', 'Faelic')
-_langcodes[19] = ('', 'Galician')
-_langcodes[20] = ('IS', 'Iceland')
-_langcodes[21] = ('IT', 'Italian')
-_langcodes[22] = ('', 'Lappish')
-_langcodes[23] = ('', 'Latin')
-_langcodes[24] = ('LV', 'Latvian')
-_langcodes[25] = ('LU', 'Luxembourgian')
-_langcodes[26] = ('LT', 'Lithuanian')
-_langcodes[27] = ('HU', 'Hungarian')
-_langcodes[28] = ('MT', 'Maltese')
-_langcodes[29] = ('NL', 'Dutch')
-_langcodes[30] = ('NO', 'Norwegian')
-_langcodes[31] = ('', 'Occitan')
-_langcodes[32] = ('PL', 'Polish')
-_langcodes[33] = ('PT', 'Portuguese')
-_langcodes[34] = ('RO', 'Romania')
-_langcodes[35] = ('', 'Romanish')
-_langcodes[36] = ('RS', 'Serbian')
-_langcodes[37] = ('SK', 'Slovak')
-_langcodes[38] = ('SI', 'Slovenian')
-_langcodes[39] = ('FI', 'Finnish')
-_langcodes[40] = ('SE', 'Swedish')
-_langcodes[41] = ('TR', 'Turkish')
-_langcodes[42] = ('', 'Flemish')
-_langcodes[43] = ('', 'Wallon')
-
-# Jumps to 0x45 = 69
-_langcodes[69] = ('', 'Zulu')
-_langcodes[70] = ('VN', 'Vietnamese')
-_langcodes[71] = ('UZ', 'Uzbek')
-_langcodes[72] = ('', 'Urdu')
-_langcodes[73] = ('UA', 'Ukranian')
-_langcodes[74] = ('TH', 'Thai')
-_langcodes[75] = ('', 'Telugu')
-_langcodes[76] = ('', 'Tatar')
-_langcodes[77] = ('', 'Tamil')
-_langcodes[78] = ('', 'Tadzhik')
-_langcodes[79] = ('', 'Swahili')
-_langcodes[80] = ('', 'Sranan Tongo')
-_langcodes[81] = ('SO', 'Somali')
-_langcodes[82] = ('', 'Sinhalese')
-_langcodes[83] = ('', 'Shona')
-_langcodes[84] = ('', 'Serbo-croat')
-_langcodes[85] = ('', 'Ruthenian')
-_langcodes[86] = ('RU', 'Russian')
-_langcodes[87] = ('', 'Quechua')
-_langcodes[88] = ('', 'Pushtu')
-_langcodes[89] = ('', 'Punjabi')
-_langcodes[90] = ('', 'Persian')
-_langcodes[91] = ('', 'Papamiento')
-_langcodes[92] = ('', 'Oriya')
-_langcodes[93] = ('NP', 'Nepali')
-_langcodes[94] = ('', 'Ndebele')
-_langcodes[95] = ('', 'Marathi')
-_langcodes[96] = ('MD', 'Moldavian')
-_langcodes[97] = ('MY', 'Malaysian')
-_langcodes[98] = ('', 'Malagasay')
-_langcodes[99] = ('MK', 'Macedonian')
-_langcodes[100] = ('LA', 'Laotian')
-_langcodes[101] = ('KR', 'Korean')
-_langcodes[102] = ('', 'Khmer')
-_langcodes[103] = ('', 'Kazakh')
-_langcodes[104] = ('', 'Kannada')
-_langcodes[105] = ('JP', 'Japanese')
-_langcodes[106] = ('ID', 'Indonesian')
-_langcodes[107] = ('', 'Hindi')
-_langcodes[108] = ('IL', 'Hebrew')
-_langcodes[109] = ('', 'Hausa')
-_langcodes[110] = ('', 'Gurani')
-_langcodes[111] = ('', 'Gujarati')
-_langcodes[112] = ('GR', 'Greek')
-_langcodes[113] = ('GE', 'Georgian')
-_langcodes[114] = ('', 'Fulani')
-_langcodes[115] = ('', 'Dari')
-_langcodes[116] = ('', 'Churash')
-_langcodes[117] = ('CN', 'Chinese')
-_langcodes[118] = ('MM', 'Burmese')
-_langcodes[119] = ('BG', 'Bulgarian')
-_langcodes[120] = ('BD', 'Bengali')
-_langcodes[121] = ('', 'Bielorussian')
-_langcodes[122] = ('', 'Bambora')
-_langcodes[123] = ('', 'Azerbaijani')
-_langcodes[124] = ('', 'Assamese')
-_langcodes[125] = ('AM', 'Armenian')
-_langcodes[126] = ('', 'Arabic')
-_langcodes[127] = ('', 'Amharic')
-
+_langcodes = {
+	0: ('??', 'Unknown'),
+	1: ('AL', 'Albania'),
+	2: ('', 'Breton'),
+	3: ('', 'Catalan'),
+	4: ('HR', 'Croatian'),
+	5: ('', 'Welsh'),
+	6: ('CZ', 'Czech'),
+	7: ('DK', 'Danish'),
+	8: ('DE', 'German'),
+	9: ('EN', 'English'),
+	10: ('ES', 'Spanish'),
+	11: ('', 'Esperanto'),
+	12: ('EE', 'Estonian'),
+	13: ('', 'Basque'),
+	14: ('FO', 'Faroese'),
+	15: ('FR', 'French'),
+	16: ('', 'Frisian'),
+	17: ('', 'Irish'),
+	18: ('', 'Faelic'),
+	19: ('', 'Galician'),
+	20: ('IS', 'Iceland'),
+	21: ('IT', 'Italian'),
+	22: ('', 'Lappish'),
+	23: ('', 'Latin'),
+	24: ('LV', 'Latvian'),
+	25: ('LU', 'Luxembourgian'),
+	26: ('LT', 'Lithuanian'),
+	27: ('HU', 'Hungarian'),
+	28: ('MT', 'Maltese'),
+	29: ('NL', 'Dutch'),
+	30: ('NO', 'Norwegian'),
+	31: ('', 'Occitan'),
+	32: ('PL', 'Polish'),
+	33: ('PT', 'Portuguese'),
+	34: ('RO', 'Romania'),
+	35: ('', 'Romanish'),
+	36: ('RS', 'Serbian'),
+	37: ('SK', 'Slovak'),
+	38: ('SI', 'Slovenian'),
+	39: ('FI', 'Finnish'),
+	40: ('SE', 'Swedish'),
+	41: ('TR', 'Turkish'),
+	42: ('', 'Flemish'),
+	43: ('', 'Wallon'),
+
+	# Jumps to 0x45 = 69
+	69: ('', 'Zulu'),
+	70: ('VN', 'Vietnamese'),
+	71: ('UZ', 'Uzbek'),
+	72: ('', 'Urdu'),
+	73: ('UA', 'Ukranian'),
+	74: ('TH', 'Thai'),
+	75: ('', 'Telugu'),
+	76: ('', 'Tatar'),
+	77: ('', 'Tamil'),
+	78: ('', 'Tadzhik'),
+	79: ('', 'Swahili'),
+	80: ('', 'Sranan Tongo'),
+	81: ('SO', 'Somali'),
+	82: ('', 'Sinhalese'),
+	83: ('', 'Shona'),
+	84: ('', 'Serbo-croat'),
+	85: ('', 'Ruthenian'),
+	86: ('RU', 'Russian'),
+	87: ('', 'Quechua'),
+	88: ('', 'Pushtu'),
+	89: ('', 'Punjabi'),
+	90: ('', 'Persian'),
+	91: ('', 'Papamiento'),
+	92: ('', 'Oriya'),
+	93: ('NP', 'Nepali'),
+	94: ('', 'Ndebele'),
+	95: ('', 'Marathi'),
+	96: ('MD', 'Moldavian'),
+	97: ('MY', 'Malaysian'),
+	98: ('', 'Malagasay'),
+	99: ('MK', 'Macedonian'),
+	100: ('LA', 'Laotian'),
+	101: ('KR', 'Korean'),
+	102: ('', 'Khmer'),
+	103: ('', 'Kazakh'),
+	104: ('', 'Kannada'),
+	105: ('JP', 'Japanese'),
+	106: ('ID', 'Indonesian'),
+	107: ('', 'Hindi'),
+	108: ('IL', 'Hebrew'),
+	109: ('', 'Hausa'),
+	110: ('', 'Gurani'),
+	111: ('', 'Gujarati'),
+	112: ('GR', 'Greek'),
+	113: ('GE', 'Georgian'),
+	114: ('', 'Fulani'),
+	115: ('', 'Dari'),
+	116: ('', 'Churash'),
+	117: ('CN', 'Chinese'),
+	118: ('MM', 'Burmese'),
+	119: ('BG', 'Bulgarian'),
+	120: ('BD', 'Bengali'),
+	121: ('', 'Bielorussian'),
+	122: ('', 'Bambora'),
+	123: ('', 'Azerbaijani'),
+	124: ('', 'Assamese'),
+	125: ('AM', 'Armenian'),
+	126: ('', 'Arabic'),
+	127: ('', 'Amharic'),
+}
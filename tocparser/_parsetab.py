@@ -0,0 +1,103 @@
+
+# _parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ARRANGER BYTEOFFSET CATALOG CD_TEXT COLON COMMA COMPOSER COPY DATAFILE DISC_ID FIFO FILE FOUR_CHANNEL_AUDIO GENRE INDEX ISRC KEYWORD LANGUAGE LANGUAGE_MAP LCURLY MESSAGE NO NUMBER PERFORMER PREGAP PRE_EMPHASIS RCURLY RESERVED1 RESERVED2 RESERVED3 RESERVED4 SILENCE SIZE_INFO SONGWRITER START SUBCHMODE TEXT TIME TITLE TOCTYPE TOC_INFO1 TOC_INFO2 TRACK TRACKMODE TWO_CHANNEL_AUDIO UPC_EAN ZEROWHOLE : HEADITEMS TRKSHEADITEMS : HEADITEMS HEADITEMHEADITEMS : HEADITEMHEADITEM : TOCTYPEHEADITEM : CATTEXTHEADITEM : HEADERCATTEXT : CATALOG TEXTHEADER : CD_TEXT LCURLY LMAP CDLANGS RCURLYLMAP : LANGUAGE_MAP LCURLY LMAPOPTS RCURLYLMAPOPTS : LMAPOPTS LMAPOPTLMAPOPTS : LMAPOPTLMAPOPT : NUMBER COLON NUMBERTRKS : TRKS TRKTRKS : TRKTRKS : TRKS errorTRKS : errorTRK : TRACK TRACKMODE SUBCHMODE TRKOPTS TRKBODYTRK : TRACK TRACKMODE           TRKOPTS TRKBODYTRKOPTS : TRKOPTS NO COPYTRKOPTS : TRKOPTS COPYTRKOPTS : TRKOPTS NO PRE_EMPHASISTRKOPTS : TRKOPTS PRE_EMPHASISTRKOPTS : TRKOPTS TWO_CHANNEL_AUDIOTRKOPTS : TRKOPTS FOUR_CHANNEL_AUDIOTRKOPTS : TRKOPTS ISRC TEXTTRKOPTS : TRKOPTS CDTTRKOPTS : TRKOPTS PREGAP TIMETRKOPTS :CDT : CD_TEXT LCURLY CDLANGS RCURLYCDLANGS : CDLANGS CDLANGCDLANGS : CDLANGCDLANG : LANGUAGE NUMBER LCURLY CDLANGOPTS RCURLYCDLANGOPTS : CDLANGOPTS CDLANGOPTCDLANGOPTS : CDLANGOPTCDLANGOPT : TITLE TEXTCDLANGOPT : PERFORMER TEXTCDLANGOPT : MESSAGE TEXTCDLANGOPT : GENRE LCURLY NUMBERCSV RCURLYCDLANGOPT : SIZE_INFO LCURLY NUMBERCSV RCURLYCDLANGOPT : SONGWRITER TEXTCDLANGOPT : COMPOSER TEXTCDLANGOPT : ARRANGER TEXTCDLANGOPT : DISC_ID TEXTCDLANGOPT : UPC_EAN TEXTCDLANGOPT : ISRC TEXTCDLANGOPT : RESERVED1 TEXTCDLANGOPT : RESERVED2 TEXTCDLANGOPT : RESERVED3 TEXTCDLANGOPT : RESERVED4 TEXTCDLANGOPT : TOC_INFO1 LCURLY NUMBERCSV RCURLYCDLANGOPT : TOC_INFO2 LCURLY NUMBERCSV RCURLYNUMBERCSV : NUMBERCSV COMMA NUMBERNUMBERCSV : NUMBERTRKBODY : TRKBODY TRKITEMTRKBODY : TRKITEMTRKITEM : FILE TEXT BYTEOFFSET TIMEVAL TIMEVALTRKITEM : FILE TEXT BYTEOFFSET TIMEVALTRKITEM : FILE TEXT            TIMEVAL TIMEVALTRKITEM : FILE TEXT            TIMEVALTRKITEM : DATAFILE TEXT BYTEOFFSET TIMEVALTRKITEM : DATAFILE TEXT BYTEOFFSETTRKITEM : DATAFILE TEXT            TIMEVALTRKITEM : DATAFILE TEXTTRKITEM : FIFO TEXT TIMEVALTRKITEM : SILENCE TIMEVALTRKITEM : ZERO TRACKMODE SUBCHMODE TIMEVALTRKITEM : ZERO TRACKMODE           TIMEVALTRKITEM : ZERO                     TIMEVALTRKITEM : START TIMETRKITEM : STARTTRKITEM : INDEX TIMETIMEVAL : TIME\n\t           | NUMBER'
+    
+_lr_action_items = {'TOCTYPE':([0,2,3,4,5,6,10,14,46,],[4,4,-3,-4,-5,-6,-2,-7,-8,]),'CATALOG':([0,2,3,4,5,6,10,14,46,],[7,7,-3,-4,-5,-6,-2,-7,-8,]),'CD_TEXT':([0,2,3,4,5,6,10,14,18,21,22,27,30,31,32,33,35,46,54,55,56,57,101,],[8,8,-3,-4,-5,-6,-2,-7,-28,-28,38,38,-20,-22,-23,-24,-26,-8,-19,-21,-25,-27,-29,]),'$end':([1,9,11,12,16,17,28,37,44,52,53,60,62,63,64,66,67,68,75,76,77,78,80,102,103,104,105,125,],[0,-1,-14,-16,-13,-15,-18,-55,-70,-17,-54,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-57,-58,-60,-66,-56,]),'error':([2,3,4,5,6,9,10,11,12,14,16,17,28,37,44,46,52,53,60,62,63,64,66,67,68,75,76,77,78,80,102,103,104,105,125,],[12,-3,-4,-5,-6,17,-2,-14,-16,-7,-13,-15,-18,-55,-70,-8,-17,-54,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-57,-58,-60,-66,-56,]),'TRACK':([2,3,4,5,6,9,10,11,12,14,16,17,28,37,44,46,52,53,60,62,63,64,66,67,68,75,76,77,78,80,102,103,104,105,125,],[13,-3,-4,-5,-6,13,-2,-14,-16,-7,-13,-15,-18,-55,-70,-8,-17,-54,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-57,-58,-60,-66,-56,]),'TEXT':([7,34,39,40,41,83,84,85,88,89,90,91,92,93,94,95,96,97,],[14,56,59,60,61,108,109,110,113,114,115,116,117,118,119,120,121,122,]),'LCURLY':([8,20,38,48,86,87,98,99,],[15,26,58,69,111,112,123,124,]),'TRACKMODE':([13,43,],[18,65,]),'LANGUAGE_MAP':([15,],[20,]),'SUBCHMODE':([18,65,],[21,79,]),'NO':([18,21,22,27,30,31,32,33,35,54,55,56,57,101,],[-28,-28,29,29,-20,-22,-23,-24,-26,-19,-21,-25,-27,-29,]),'COPY':([18,21,22,27,29,30,31,32,33,35,54,55,56,57,101,],[-28,-28,30,30,54,-20,-22,-23,-24,-26,-19,-21,-25,-27,-29,]),'PRE_EMPHASIS':([18,21,22,27,29,30,31,32,33,35,54,55,56,57,101,],[-28,-28,31,31,55,-20,-22,-23,-24,-26,-19,-21,-25,-27,-29,]),'TWO_CHANNEL_AUDIO':([18,21,22,27,30,31,32,33,35,54,55,56,57,101,],[-28,-28,32,32,-20,-22,-23,-24,-26,-19,-21,-25,-27,-29,]),'FOUR_CHANNEL_AUDIO':([18,21,22,27,30,31,32,33,35,54,55,56,57,101,],[-28,-28,33,33,-20,-22,-23,-24,-26,-19,-21,-25,-27,-29,]),'ISRC':([18,21,22,27,30,31,32,33,35,54,55,56,57,69,81,82,101,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[-28,-28,34,34,-20,-22,-23,-24,-26,-19,-21,-25,-27,93,93,-34,-29,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'PREGAP':([18,21,22,27,30,31,32,33,35,54,55,56,57,101,],[-28,-28,36,36,-20,-22,-23,-24,-26,-19,-21,-25,-27,-29,]),'FILE':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,39,39,39,-20,-22,-23,-24,-26,-55,-70,39,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'DATAFILE':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,40,40,40,-20,-22,-23,-24,-26,-55,-70,40,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'FIFO':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,41,41,41,-20,-22,-23,-24,-26,-55,-70,41,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'SILENCE':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,42,42,42,-20,-22,-23,-24,-26,-55,-70,42,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'ZERO':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,43,43,43,-20,-22,-23,-24,-26,-55,-70,43,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'START':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,44,44,44,-20,-22,-23,-24,-26,-55,-70,44,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'INDEX':([18,21,22,27,28,30,31,32,33,35,37,44,52,53,54,55,56,57,60,62,63,64,66,67,68,75,76,77,78,80,101,102,103,104,105,125,],[-28,-28,45,45,45,-20,-22,-23,-24,-26,-55,-70,45,-54,-19,-21,-25,-27,-63,-65,-72,-73,-68,-69,-71,-59,-61,-62,-64,-67,-29,-57,-58,-60,-66,-56,]),'LANGUAGE':([19,23,24,47,58,70,73,106,],[25,25,-31,-30,25,-9,25,-32,]),'RCURLY':([23,24,47,49,50,71,73,81,82,100,106,107,108,109,110,113,114,115,116,117,118,119,120,121,122,126,127,128,129,130,131,133,134,135,136,],[46,-31,-30,70,-11,-10,101,106,-34,-12,-32,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,131,-53,133,134,135,-38,-39,-50,-51,-52,]),'NUMBER':([25,26,42,43,49,50,59,60,61,63,64,65,71,72,74,75,76,79,100,102,111,112,123,124,132,],[48,51,64,64,51,-11,64,64,64,-72,-73,64,-10,100,64,64,64,64,-12,64,127,127,127,127,136,]),'TIME':([36,42,43,44,45,59,60,61,63,64,65,74,75,76,79,102,],[57,63,63,67,68,63,63,63,-72,-73,63,63,63,63,63,63,]),'COLON':([51,],[72,]),'BYTEOFFSET':([59,60,],[74,76,]),'TITLE':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[83,83,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'PERFORMER':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[84,84,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'MESSAGE':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[85,85,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'GENRE':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[86,86,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'SIZE_INFO':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[87,87,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'SONGWRITER':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[88,88,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'COMPOSER':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[89,89,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'ARRANGER':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[90,90,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'DISC_ID':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[91,91,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'UPC_EAN':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[92,92,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'RESERVED1':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[94,94,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'RESERVED2':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[95,95,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'RESERVED3':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[96,96,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'RESERVED4':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[97,97,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'TOC_INFO1':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[98,98,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'TOC_INFO2':([69,81,82,107,108,109,110,113,114,115,116,117,118,119,120,121,122,131,133,134,135,],[99,99,-34,-33,-35,-36,-37,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-38,-39,-50,-51,]),'COMMA':([126,127,128,129,130,136,],[132,-53,132,132,132,-52,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'WHOLE':([0,],[1,]),'HEADITEMS':([0,],[2,]),'HEADITEM':([0,2,],[3,10,]),'CATTEXT':([0,2,],[5,5,]),'HEADER':([0,2,],[6,6,]),'TRKS':([2,],[9,]),'TRK':([2,9,],[11,16,]),'LMAP':([15,],[19,]),'TRKOPTS':([18,21,],[22,27,]),'CDLANGS':([19,58,],[23,73,]),'CDLANG':([19,23,58,73,],[24,47,24,47,]),'TRKBODY':([22,27,],[28,52,]),'CDT':([22,27,],[35,35,]),'TRKITEM':([22,27,28,52,],[37,37,53,53,]),'LMAPOPTS':([26,],[49,]),'LMAPOPT':([26,49,],[50,71,]),'TIMEVAL':([42,43,59,60,61,65,74,75,76,79,102,],[62,66,75,77,78,80,102,103,104,105,125,]),'CDLANGOPTS':([69,],[81,]),'CDLANGOPT':([69,81,],[82,107,]),'NUMBERCSV':([111,112,123,124,],[126,128,129,130,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> WHOLE","S'",1,None,None,None),
+  ('WHOLE -> HEADITEMS TRKS','WHOLE',2,'p_WHOLE','lex.py',545),
+  ('HEADITEMS -> HEADITEMS HEADITEM','HEADITEMS',2,'p_HEADITEMS','lex.py',551),
+  ('HEADITEMS -> HEADITEM','HEADITEMS',1,'p_HEADITEMS_term','lex.py',556),
+  ('HEADITEM -> TOCTYPE','HEADITEM',1,'p_HEADITEM_type','lex.py',560),
+  ('HEADITEM -> CATTEXT','HEADITEM',1,'p_HEADITEM_catalog','lex.py',564),
+  ('HEADITEM -> HEADER','HEADITEM',1,'p_HEADITEM_header','lex.py',568),
+  ('CATTEXT -> CATALOG TEXT','CATTEXT',2,'p_CATTEXT','lex.py',572),
+  ('HEADER -> CD_TEXT LCURLY LMAP CDLANGS RCURLY','HEADER',5,'p_HEADER','lex.py',576),
+  ('LMAP -> LANGUAGE_MAP LCURLY LMAPOPTS RCURLY','LMAP',4,'p_LMAP','lex.py',580),
+  ('LMAPOPTS -> LMAPOPTS LMAPOPT','LMAPOPTS',2,'p_LMAPOPTS','lex.py',584),
+  ('LMAPOPTS -> LMAPOPT','LMAPOPTS',1,'p_LMAPOPTS_term','lex.py',589),
+  ('LMAPOPT -> NUMBER COLON NUMBER','LMAPOPT',3,'p_LMAPOPT','lex.py',593),
+  ('TRKS -> TRKS TRK','TRKS',2,'p_TRKS','lex.py',597),
+  ('TRKS -> TRK','TRKS',1,'p_TRKS_term','lex.py',602),
+  ('TRKS -> TRKS error','TRKS',2,'p_TRKS_error','lex.py',606),
+  ('TRKS -> error','TRKS',1,'p_TRKS_error_term','lex.py',611),
+  ('TRK -> TRACK TRACKMODE SUBCHMODE TRKOPTS TRKBODY','TRK',5,'p_TRK_subchannel','lex.py',615),
+  ('TRK -> TRACK TRACKMODE TRKOPTS TRKBODY','TRK',4,'p_TRK','lex.py',619),
+  ('TRKOPTS -> TRKOPTS NO COPY','TRKOPTS',3,'p_TRKOPTS_nocopy','lex.py',651),
+  ('TRKOPTS -> TRKOPTS COPY','TRKOPTS',2,'p_TRKOPTS_copy','lex.py',658),
+  ('TRKOPTS -> TRKOPTS NO PRE_EMPHASIS','TRKOPTS',3,'p_TRKOPTS_nopreemphasis','lex.py',664),
+  ('TRKOPTS -> TRKOPTS PRE_EMPHASIS','TRKOPTS',2,'p_TRKOPTS_preemphasis','lex.py',670),
+  ('TRKOPTS -> TRKOPTS TWO_CHANNEL_AUDIO','TRKOPTS',2,'p_TRKOPTS_twochannel','lex.py',676),
+  ('TRKOPTS -> TRKOPTS FOUR_CHANNEL_AUDIO','TRKOPTS',2,'p_TRKOPTS_fourchannel','lex.py',682),
+  ('TRKOPTS -> TRKOPTS ISRC TEXT','TRKOPTS',3,'p_TRKOPTS_isrc','lex.py',688),
+  ('TRKOPTS -> TRKOPTS CDT','TRKOPTS',2,'p_TRKOPTS_cdtext','lex.py',694),
+  ('TRKOPTS -> TRKOPTS PREGAP TIME','TRKOPTS',3,'p_TRKOPTS_pregap','lex.py',700),
+  ('TRKOPTS -> <empty>','TRKOPTS',0,'p_TRKOPTS_empty','lex.py',706),
+  ('CDT -> CD_TEXT LCURLY CDLANGS RCURLY','CDT',4,'p_CDT','lex.py',710),
+  ('CDLANGS -> CDLANGS CDLANG','CDLANGS',2,'p_CDLANGS','lex.py',714),
+  ('CDLANGS -> CDLANG','CDLANGS',1,'p_CDLANGS_term','lex.py',719),
+  ('CDLANG -> LANGUAGE NUMBER LCURLY CDLANGOPTS RCURLY','CDLANG',5,'p_CDLANG','lex.py',723),
+  ('CDLANGOPTS -> CDLANGOPTS CDLANGOPT','CDLANGOPTS',2,'p_CDLANGOPTS','lex.py',727),
+  ('CDLANGOPTS -> CDLANGOPT','CDLANGOPTS',1,'p_CDLANGOPTS_term','lex.py',732),
+  ('CDLANGOPT -> TITLE TEXT','CDLANGOPT',2,'p_CDLANGOPT_title','lex.py',736),
+  ('CDLANGOPT -> PERFORMER TEXT','CDLANGOPT',2,'p_CDLANGOPT_performer','lex.py',740),
+  ('CDLANGOPT -> MESSAGE TEXT','CDLANGOPT',2,'p_CDLANGOPT_message','lex.py',744),
+  ('CDLANGOPT -> GENRE LCURLY NUMBERCSV RCURLY','CDLANGOPT',4,'p_CDLANGOPT_genre','lex.py',748),
+  ('CDLANGOPT -> SIZE_INFO LCURLY NUMBERCSV RCURLY','CDLANGOPT',4,'p_CDLANGOPT_sizeinfo','lex.py',752),
+  ('CDLANGOPT -> SONGWRITER TEXT','CDLANGOPT',2,'p_CDLANGOPT_songwriter','lex.py',756),
+  ('CDLANGOPT -> COMPOSER TEXT','CDLANGOPT',2,'p_CDLANGOPT_composer','lex.py',760),
+  ('CDLANGOPT -> ARRANGER TEXT','CDLANGOPT',2,'p_CDLANGOPT_arranger','lex.py',764),
+  ('CDLANGOPT -> DISC_ID TEXT','CDLANGOPT',2,'p_CDLANGOPT_discid','lex.py',768),
+  ('CDLANGOPT -> UPC_EAN TEXT','CDLANGOPT',2,'p_CDLANGOPT_upcean','lex.py',772),
+  ('CDLANGOPT -> ISRC TEXT','CDLANGOPT',2,'p_CDLANGOPT_isrc','lex.py',776),
+  ('CDLANGOPT -> RESERVED1 TEXT','CDLANGOPT',2,'p_CDLANGOPT_reserved1','lex.py',780),
+  ('CDLANGOPT -> RESERVED2 TEXT','CDLANGOPT',2,'p_CDLANGOPT_reserved2','lex.py',784),
+  ('CDLANGOPT -> RESERVED3 TEXT','CDLANGOPT',2,'p_CDLANGOPT_reserved3','lex.py',788),
+  ('CDLANGOPT -> RESERVED4 TEXT','CDLANGOPT',2,'p_CDLANGOPT_reserved4','lex.py',792),
+  ('CDLANGOPT -> TOC_INFO1 LCURLY NUMBERCSV RCURLY','CDLANGOPT',4,'p_CDLANGOPT_tocinfo1','lex.py',796),
+  ('CDLANGOPT -> TOC_INFO2 LCURLY NUMBERCSV RCURLY','CDLANGOPT',4,'p_CDLANGOPT_tocinfo2','lex.py',800),
+  ('NUMBERCSV -> NUMBERCSV COMMA NUMBER','NUMBERCSV',3,'p_NUMBERCSV','lex.py',804),
+  ('NUMBERCSV -> NUMBER','NUMBERCSV',1,'p_NUMBERCSV_term','lex.py',809),
+  ('TRKBODY -> TRKBODY TRKITEM','TRKBODY',2,'p_TRKBODY','lex.py',813),
+  ('TRKBODY -> TRKITEM','TRKBODY',1,'p_TRKBODY_term','lex.py',818),
+  ('TRKITEM -> FILE TEXT BYTEOFFSET TIMEVAL TIMEVAL','TRKITEM',5,'p_TRKITEM_file_offset_length','lex.py',822),
+  ('TRKITEM -> FILE TEXT BYTEOFFSET TIMEVAL','TRKITEM',4,'p_TRKITEM_file_offset','lex.py',826),
+  ('TRKITEM -> FILE TEXT TIMEVAL TIMEVAL','TRKITEM',4,'p_TRKITEM_file_length','lex.py',830),
+  ('TRKITEM -> FILE TEXT TIMEVAL','TRKITEM',3,'p_TRKITEM_file','lex.py',834),
+  ('TRKITEM -> DATAFILE TEXT BYTEOFFSET TIMEVAL','TRKITEM',4,'p_TRKITEM_datafile_offset_length','lex.py',838),
+  ('TRKITEM -> DATAFILE TEXT BYTEOFFSET','TRKITEM',3,'p_TRKITEM_datafile_offset','lex.py',842),
+  ('TRKITEM -> DATAFILE TEXT TIMEVAL','TRKITEM',3,'p_TRKITEM_datafile_length','lex.py',846),
+  ('TRKITEM -> DATAFILE TEXT','TRKITEM',2,'p_TRKITEM_datafile','lex.py',850),
+  ('TRKITEM -> FIFO TEXT TIMEVAL','TRKITEM',3,'p_TRKITEM_fifo','lex.py',854),
+  ('TRKITEM -> SILENCE TIMEVAL','TRKITEM',2,'p_TRKITEM_silence','lex.py',858),
+  ('TRKITEM -> ZERO TRACKMODE SUBCHMODE TIMEVAL','TRKITEM',4,'p_TRKITEM_zero_mode_subchannel','lex.py',862),
+  ('TRKITEM -> ZERO TRACKMODE TIMEVAL','TRKITEM',3,'p_TRKITEM_zero_mode','lex.py',866),
+  ('TRKITEM -> ZERO TIMEVAL','TRKITEM',2,'p_TRKITEM_zero','lex.py',870),
+  ('TRKITEM -> START TIME','TRKITEM',2,'p_TRKITEM_start_time','lex.py',874),
+  ('TRKITEM -> START','TRKITEM',1,'p_TRKITEM_start','lex.py',878),
+  ('TRKITEM -> INDEX TIME','TRKITEM',2,'p_TRKITEM_index','lex.py',882),
+  ('TIMEVAL -> TIME','TIMEVAL',1,'p_TIMEVAL','lex.py',886),
+  ('TIMEVAL -> NUMBER','TIMEVAL',1,'p_TIMEVAL','lex.py',887),
+]
@@ -0,0 +1,251 @@
+"""
+Command line tool to inspect many TOC files at once.
+Files are parsed on a pool of worker processes and one record per file is streamed to stdout as
+JSON Lines, CSV, or a human readable summary.
+
+	python3 -m tocparser [options] PATH [PATH ...]
+
+Each PATH can be a file, a directory (searched recursively for *.toc), or a glob.
+"""
+
+import argparse
+import csv
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from . import TOC, MSF
+
+# Fields of a record that hold a single value (used for CSV and summary output)
+_scalarfields = ['path', 'error', 'digest', 'catalog', 'track_count', 'total_frames', 'total_length', 'title', 'performer']
+
+# All fields of a record
+_allfields = _scalarfields + ['diagnostics', 'tracks']
+
+def main(argv=None):
+	"""
+	Entry point for the command line tool, returns the exit status.
+	"""
+	args = _argparser().parse_args(argv)
+
+	if args.fields:
+		fields = [f.strip() for f in args.fields.split(',') if f.strip()]
+		bad = [f for f in fields if f not in _allfields]
+		if bad:
+			print("Unknown field(s): %s (choose from %s)" % (', '.join(bad), ', '.join(_allfields)), file=sys.stderr)
+			return 2
+	elif args.format == 'jsonl':
+		fields = _allfields
+	else:
+		fields = _scalarfields
+
+	if args.format == 'csv' and set(fields) - set(_scalarfields):
+		print("The %s field(s) cannot be written as CSV" % ', '.join(f for f in fields if f not in _scalarfields), file=sys.stderr)
+		return 2
+
+	out = _writers[args.format](sys.stdout, fields)
+
+	files = 0
+	errors = 0
+	t0 = time.perf_counter()
+
+	try:
+		try:
+			for rec in _inspectall(_findfiles(args.paths), args.jobs, args.recover):
+				files += 1
+				if rec['error'] is not None:
+					errors += 1
+
+				out.write(rec)
+
+				if rec['error'] is not None and args.fail_fast:
+					break
+		finally:
+			out.close()
+			sys.stdout.flush()
+
+	except BrokenPipeError:
+		# Whatever reads the output stopped early (e.g., head), so stop too; stdout goes to devnull as Python flushes it again on exit
+		os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+	finally:
+		if args.stats:
+			dt = time.perf_counter() - t0
+			print("files: %d  errors: %d  elapsed: %.3fs  files/sec: %.1f" % (files, errors, dt, files/dt if dt > 0 else 0.0), file=sys.stderr)
+
+	return 1 if errors else 0
+
+def _argparser():
+	p = argparse.ArgumentParser(prog='tocparser', description='Parse cdrdao TOC files and print a record for each.')
+	p.add_argument('paths', nargs='+', metavar='PATH', help='TOC file, directory to search recursively, or glob')
+	p.add_argument('-f', '--format', choices=sorted(_writers), default='jsonl', help='Output format (default: jsonl)')
+	p.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Number of worker processes (default: number of CPUs)')
+	p.add_argument('--fields', help='Comma separated list of fields to output: %s' % ', '.join(_allfields))
+	p.add_argument('--stats', action='store_true', help='Print files, errors, and files/sec to stderr when done')
+	p.add_argument('--recover', action='store_true', help='Skip broken tracks and report them in the diagnostics field instead of failing the file')
+
+	g = p.add_mutually_exclusive_group()
+	g.add_argument('--fail-fast', dest='fail_fast', action='store_true', help='Stop at the first file that fails to parse')
+	g.add_argument('--continue', dest='fail_fast', action='store_false', help='Keep going past files that fail to parse (default)')
+
+	return p
+
+def _findfiles(paths):
+	"""
+	Generator of file paths from the files, directories, and globs in @paths.
+	"""
+	for path in paths:
+		if os.path.isdir(path):
+			for root, dirs, files in os.walk(path):
+				dirs.sort()
+				for name in sorted(files):
+					if name.lower().endswith('.toc'):
+						yield os.path.join(root, name)
+
+		elif os.path.exists(path) or not glob.has_magic(path):
+			# Missing files are passed through so they get reported as errors
+			yield path
+
+		else:
+			matches = sorted(glob.iglob(path, recursive=True))
+			if not matches:
+				# A pattern that matches nothing is reported as a missing file rather than quietly doing no work
+				yield path
+
+			for match in matches:
+				if os.path.isdir(match):
+					yield from _findfiles([match])
+				else:
+					yield match
+
+def _inspectall(paths, jobs, recover):
+	"""
+	Generator of records for each of @paths, in order, parsing on @jobs worker processes.
+	"""
+	func = functools.partial(_inspect, recover=recover)
+
+	if jobs <= 1:
+		yield from map(func, paths)
+		return
+
+	with multiprocessing.Pool(jobs) as pool:
+		yield from pool.imap(func, paths, chunksize=16)
+
+def _inspect(path, recover=False):
+	"""
+	Parses the file at @path and returns its record.
+	Errors are caught and returned in the record so that one bad file does not stop a worker.
+	"""
+	rec = dict.fromkeys(_allfields)
+	rec['path'] = path
+
+	try:
+		t = TOC.load(path, recover=recover)
+	except Exception as e:
+		rec['error'] = "%s: %s" % (type(e).__name__, e)
+		return rec
+
+	rec['diagnostics'] = [str(d) for d in t.Diagnostics]
+
+	length = t.TotalLength
+
+	rec['digest'] = t.Digest
+	rec['catalog'] = t.Catalog
+	rec['track_count'] = len(t.Tracks)
+	rec['total_frames'] = length.TotalFrames if length is not None else None
+	rec['total_length'] = str(length) if length is not None else None
+
+	if t.Header is not None:
+		meta = _firstlang(t.Header.Meta)
+		rec['title'] = meta.get('title')
+		rec['performer'] = meta.get('performer')
+
+	rec['tracks'] = []
+	for trk in t.Tracks:
+		meta = _firstlang(trk.Meta)
+		duration = trk.FileDuration
+		offsets = trk.IndexOffsets
+		rec['tracks'].append({
+			'number': trk.Number,
+			'isrc': trk.ISRC,
+			'path': trk.FilePath,
+			'start_frames': trk.FileStart.TotalFrames,
+			'duration_frames': duration.TotalFrames if duration is not None else None,
+			'index_offsets': list(offsets) if offsets is not None else None,
+			'title': meta.get('title'),
+			'performer': meta.get('performer'),
+		})
+
+	return rec
+
+def _firstlang(meta):
+	"""
+	Gets the CD-TEXT dictionary of the lowest language index in @meta, or an empty dictionary.
+	"""
+	if not meta:
+		return {}
+	return meta[min(meta)]
+
+class _JSONLWriter:
+	def __init__(self, f, fields):
+		self._f = f
+		self._fields = fields
+
+	def write(self, rec):
+		self._f.write(json.dumps({k: rec[k] for k in self._fields}, ensure_ascii=False) + '\n')
+		self._f.flush()
+
+	def close(self):
+		pass
+
+class _CSVWriter:
+	def __init__(self, f, fields):
+		self._f = f
+		self._w = csv.DictWriter(f, fields, extrasaction='ignore')
+		self._w.writeheader()
+
+	def write(self, rec):
+		self._w.writerow(rec)
+		self._f.flush()
+
+	def close(self):
+		pass
+
+class _SummaryWriter:
+	def __init__(self, f, fields):
+		self._f = f
+		self._fields = [k for k in fields if k in _scalarfields and k not in ('path', 'error')]
+		self._files = 0
+		self._tracks = 0
+		self._frames = 0
+		self._unknown = 0
+
+	def write(self, rec):
+		self._files += 1
+
+		if rec['error'] is not None:
+			self._f.write("%s: ERROR %s\n" % (rec['path'], rec['error']))
+		else:
+			self._tracks += rec['track_count']
+			if rec['total_frames'] is None:
+				self._unknown += 1
+			else:
+				self._frames += rec['total_frames']
+			self._f.write("%s: %s\n" % (rec['path'], '  '.join("%s=%s" % (k, rec[k]) for k in self._fields)))
+
+		self._f.flush()
+
+	def close(self):
+		# Discs of unknown length are left out of the time rather than counted as empty
+		unknown = ", %d of unknown length" % self._unknown if self._unknown else ''
+		self._f.write("Total: %d files, %d tracks, %s (%d frames)%s\n" % (self._files, self._tracks, MSF(0,0,self._frames), self._frames, unknown))
+
+_writers = {
+	'jsonl': _JSONLWriter,
+	'csv': _CSVWriter,
+	'summary': _SummaryWriter,
+}
@@ -0,0 +1,317 @@
+"""
+Structural comparison of two parsed TOC files.
+Tracks are aligned first by identical content, then by their position in the file, and finally by ISRC or CD-TEXT.
+The result is a list of Change objects describing what differs between the two.
+"""
+
+class Change:
+	"""
+	Base class of all changes returned by diff().
+	@Old and @New are the objects from the first and second TOC respectively (None if not applicable).
+	"""
+
+	def __init__(self, old, new):
+		self._old = old
+		self._new = new
+
+	def __repr__(self):
+		return "<%s old=%s new=%s>" % (type(self).__name__, _trackstr(self._old), _trackstr(self._new))
+
+	@property
+	def Old(self):
+		"""
+		Object from the first TOC.
+		"""
+		return self._old
+
+	@property
+	def New(self):
+		"""
+		Object from the second TOC.
+		"""
+		return self._new
+
+class TrackAdded(Change):
+	"""
+	A track exists only in the second TOC.
+	"""
+
+	def __init__(self, new):
+		super().__init__(None, new)
+
+class TrackRemoved(Change):
+	"""
+	A track exists only in the first TOC.
+	"""
+
+	def __init__(self, old):
+		super().__init__(old, None)
+
+class TrackMoved(Change):
+	"""
+	A track starts at a different frame offset, or in a different file.
+	"""
+	pass
+
+class TrackResized(Change):
+	"""
+	A track has a different duration in its file or on the disc.
+	"""
+	pass
+
+class FieldChanged(Change):
+	"""
+	A single field differs between two matched objects.
+	@Field names the field, @OldValue and @NewValue are the differing values.
+	"""
+
+	def __init__(self, old, new, field, oldvalue, newvalue):
+		super().__init__(old, new)
+		self._field = field
+		self._oldvalue = oldvalue
+		self._newvalue = newvalue
+
+	def __repr__(self):
+		return "<%s field=%s old=%r new=%r>" % (type(self).__name__, self._field, self._oldvalue, self._newvalue)
+
+	@property
+	def Field(self):
+		"""
+		Name of the field that changed.
+		"""
+		return self._field
+
+	@property
+	def OldValue(self):
+		"""
+		Value in the first TOC.
+		"""
+		return self._oldvalue
+
+	@property
+	def NewValue(self):
+		"""
+		Value in the second TOC.
+		"""
+		return self._newvalue
+
+class TrackMetaChanged(FieldChanged):
+	"""
+	Mode, sub-channel mode, segments, ISRC, CD-TEXT, flags, pregap, or indices of a matched track differ.
+	"""
+	pass
+
+class HeaderChanged(FieldChanged):
+	"""
+	Disc type, catalog, language map, or disc CD-TEXT differ.
+	"""
+	pass
+
+
+def diff(a, b):
+	"""
+	Compares TOC @a against TOC @b and returns a list of Change objects.
+	An empty list means the two are structurally identical.
+	If both were loaded from bytes with the same digest then no comparison is done at all.
+	"""
+
+	if a is b:
+		return []
+	if a.Digest is not None and a.Digest == b.Digest:
+		return []
+
+	changes = _diffheader(a, b)
+
+	fa = [_fingerprint(t) for t in a.Tracks]
+	fb = [_fingerprint(t) for t in b.Tracks]
+
+	# Unchanged track listing (common case when only header data was edited)
+	if fa == fb:
+		return changes
+
+	pairs = []
+	lefta = list(range(len(fa)))
+	leftb = list(range(len(fb)))
+	ta = a.Tracks
+	tb = b.Tracks
+
+	# Pass 1: identical content at the same place, ignoring the track number
+	_pairby(ta, tb, lefta, leftb, pairs, lambda t: _fingerprint(t)[1:])
+
+	# Pass 2: identical content elsewhere
+	_pairby(ta, tb, lefta, leftb, pairs, lambda t: _fingerprint(t)[4:])
+
+	# Pass 3: tracks that start at the same place in the same file, then at the same place on the disc
+	_pairby(ta, tb, lefta, leftb, pairs, lambda t: (t.FilePath, t.FileStart.TotalFrames))
+	_pairby(ta, tb, lefta, leftb, pairs, lambda t: _frames(t.DiscStart))
+
+	# Pass 4: tracks with the same ISRC and then the same CD-TEXT
+	_pairby(ta, tb, lefta, leftb, pairs, lambda t: t.ISRC)
+	_pairby(ta, tb, lefta, leftb, pairs, lambda t: _freeze(t.Meta) if len(t.Meta) else None)
+
+	for i,j in sorted(pairs):
+		changes += _difftrack(ta[i], tb[j])
+
+	for i in lefta:
+		changes.append( TrackRemoved(ta[i]) )
+
+	for j in leftb:
+		changes.append( TrackAdded(tb[j]) )
+
+	return changes
+
+def _pairby(ta, tb, lefta, leftb, pairs, keyfunc):
+	"""
+	Pairs remaining tracks in @lefta and @leftb whose @keyfunc values match, appending to @pairs and removing them from the left lists.
+	A key of None never matches.
+	"""
+	if not lefta or not leftb:
+		return
+
+	byb = {}
+	for j in leftb:
+		k = keyfunc(tb[j])
+		if k is not None:
+			byb.setdefault(k, []).append(j)
+
+	matched = set()
+	for i in list(lefta):
+		js = byb.get(keyfunc(ta[i]))
+		if js:
+			j = js.pop(0)
+			pairs.append( (i,j) )
+			lefta.remove(i)
+			matched.add(j)
+
+	leftb[:] = [j for j in leftb if j not in matched]
+
+def _diffheader(a, b):
+	"""
+	Compares the disc type, catalog, and header information of two TOC objects.
+	"""
+	ret = []
+
+	if a.Type != b.Type:
+		ret.append( HeaderChanged(a.Header, b.Header, 'type', a.Type, b.Type) )
+
+	ca = a.Catalog
+	cb = b.Catalog
+	if ca != cb:
+		ret.append( HeaderChanged(a.Header, b.Header, 'catalog', ca, cb) )
+
+	ha = a.Header
+	hb = b.Header
+	la = ha.LangMap if ha is not None else {}
+	lb = hb.LangMap if hb is not None else {}
+	if la != lb:
+		ret.append( HeaderChanged(ha, hb, 'langmap', la, lb) )
+
+	ma = ha.Meta if ha is not None else {}
+	mb = hb.Meta if hb is not None else {}
+	ret += _diffmeta(ma, mb, lambda f,o,n: HeaderChanged(ha, hb, f, o, n))
+
+	return ret
+
+def _difftrack(ta, tb):
+	"""
+	Compares two matched tracks.
+	"""
+	ret = []
+
+	if ta.FilePath != tb.FilePath or ta.FileStart.TotalFrames != tb.FileStart.TotalFrames or _frames(ta.DiscStart) != _frames(tb.DiscStart):
+		ret.append( TrackMoved(ta, tb) )
+
+	if _frames(ta.FileDuration) != _frames(tb.FileDuration) or _frames(ta.Length) != _frames(tb.Length):
+		ret.append( TrackResized(ta, tb) )
+
+	sa = _layout(ta)
+	sb = _layout(tb)
+	if sa != sb:
+		ret.append( TrackMetaChanged(ta, tb, 'segments', sa, sb) )
+
+	# Pregap and indices relative to the track so that moving alone does not count
+	ia = _relindices(ta)
+	ib = _relindices(tb)
+	if ia != ib:
+		ret.append( TrackMetaChanged(ta, tb, 'indices', ia, ib) )
+
+	for field in ('Number', 'Mode', 'SubChannelMode', 'ISRC', 'Copy', 'PreEmphasis', 'Channels'):
+		va = getattr(ta, field)
+		vb = getattr(tb, field)
+		if va != vb:
+			ret.append( TrackMetaChanged(ta, tb, field.lower(), va, vb) )
+
+	ret += _diffmeta(ta.Meta, tb.Meta, lambda f,o,n: TrackMetaChanged(ta, tb, f, o, n))
+
+	return ret
+
+def _diffmeta(ma, mb, mk):
+	"""
+	Compares two CD-TEXT dictionaries keyed by language then by field.
+	Fields are reported as "LANG.FIELD" (e.g., "0.title") and created with @mk(field, old, new).
+	"""
+	ret = []
+	if ma == mb:
+		return ret
+
+	for lang in sorted(set(ma) | set(mb)):
+		oa = ma.get(lang, {})
+		ob = mb.get(lang, {})
+		if oa == ob:
+			continue
+
+		for k in sorted(set(oa) | set(ob)):
+			va = oa.get(k)
+			vb = ob.get(k)
+			if va != vb:
+				ret.append( mk("%d.%s" % (lang,k), va, vb) )
+
+	return ret
+
+def _fingerprint(t):
+	"""
+	Hashable summary of everything that diff() compares on a track.
+	Ordered so that slices drop the number ([1:]) and the position in the file and on the disc ([4:]).
+	"""
+	return (t.Number, t.FilePath, t.FileStart.TotalFrames, _frames(t.DiscStart), _frames(t.FileDuration), _frames(t.Length), _layout(t), _relindices(t), t.Mode, t.SubChannelMode, t.ISRC, t.Copy, t.PreEmphasis, t.Channels, _freeze(t.Meta))
+
+def _relindices(t):
+	"""
+	Index offsets of track @t relative to the start of its pregap.
+	"""
+	pregap = _frames(t.Pregap)
+	if pregap is None:
+		return None
+	return (pregap,) + tuple(pregap + i.TotalFrames for i in t.Indices)
+
+def _layout(t):
+	"""
+	Kind and file of each segment of track @t.
+	Lengths and modes are left out as TrackResized and the mode fields report those, and so is FilePath (None for
+	segments read from it) as TrackMoved reports that.
+	"""
+	path = t.FilePath
+	return tuple( (s.Kind, s.FilePath if s.FilePath != path else None) for s in t.Segments )
+
+def _frames(msf):
+	"""
+	Total frames of @msf, or None for a time that is not known.
+	"""
+	return msf.TotalFrames if msf is not None else None
+
+def _freeze(v):
+	"""
+	Converts nested dictionaries and lists to hashable tuples.
+	"""
+	if isinstance(v, dict):
+		return tuple( (k,_freeze(v[k])) for k in sorted(v) )
+	elif isinstance(v, list):
+		return tuple(_freeze(x) for x in v)
+	else:
+		return v
+
+def _trackstr(t):
+	n = getattr(t, 'Number', None)
+	if n is None:
+		return 'None' if t is None else type(t).__name__
+	return "Track %d" % n
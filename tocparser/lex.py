@@ -1,16 +1,23 @@
 """
 Lexer and yaccer for TOC format.
-This implementation is limited and tweaked as needed.
+This implements the cdrdao TOC format, leniently: header items and track flags are accepted in any order.
 
 PLY is a pure python implementation of lex and yacc, the former for creating tokens from text and the latter for making sense of the order of tokens.
 Because of the intended use, the only API provided is a simple read-in-once-and-parse-it.
 
+To keep start-up fast PLY is only used to generate the LALR tables, which are shipped in _parsetab.py and run by _Parser.
+After changing the grammar regenerate them with _writetables(), otherwise PLY is imported and rebuilds them in memory on every start.
+
 The BNF is shown below and is implemented PLY-style by including one clause in its own function.
 
-      WHOLE : CD_DA CATTEXT HEADER TRKS
-	        | CD_DA         HEADER TRKS
-			| CD_DA CATTEXT        TRKS
-            | CD_DA                TRKS
+      WHOLE : HEADITEMS TRKS
+
+  HEADITEMS : HEADITEMS HEADITEM
+            | HEADITEM
+
+   HEADITEM : TOCTYPE
+            | CATTEXT
+            | HEADER
 
     CATTEXT : CATALOG TEXT
 
@@ -25,17 +32,22 @@ The BNF is shown below and is implemented PLY-style by including one clause in i
 
        TRKS : TRKS TRK
             | TRK
-
-        TRK : COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO ISRC TEXT CDT FILELINE
-            | COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO ISRC TEXT     FILELINE
-            | COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO           CDT FILELINE
-            | COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO               FILELINE
-
-        CPY : NO COPY
-            | COPY
-
-         PE : NO PRE_EMPHASIS
-            | PRE_EMPHASIS
+            | TRKS error
+            | error
+
+        TRK : TRACK TRACKMODE SUBCHMODE TRKOPTS TRKBODY
+            | TRACK TRACKMODE           TRKOPTS TRKBODY
+
+    TRKOPTS : TRKOPTS NO COPY
+            | TRKOPTS COPY
+            | TRKOPTS NO PRE_EMPHASIS
+            | TRKOPTS PRE_EMPHASIS
+            | TRKOPTS TWO_CHANNEL_AUDIO
+            | TRKOPTS FOUR_CHANNEL_AUDIO
+            | TRKOPTS ISRC TEXT
+            | TRKOPTS CDT
+            | TRKOPTS PREGAP TIME
+            |
 
         CDT : CD_TEXT LCURLY CDLANGS RCURLY
 
@@ -57,69 +69,199 @@ The BNF is shown below and is implemented PLY-style by including one clause in i
             | ARRANGER TEXT
             | DISC_ID TEXT
             | TOC_INFO1 LCURLY NUMBERCSV RCURLY
-            | UPC_EAT TEXT
+            | TOC_INFO2 LCURLY NUMBERCSV RCURLY
+            | UPC_EAN TEXT
             | ISRC TEXT
+            | RESERVED1 TEXT
+            | RESERVED2 TEXT
+            | RESERVED3 TEXT
 			| RESERVED4 TEXT
 
   NUMBERCSV : NUMBERCSV COMMA NUMBER
 
-   FILELINE : FILE TEXT TIMES START TIME INDICES
-            | FILE TEXT TIMES START TIME
-            | FILE TEXT TIMES            INDICES
-            | FILE TEXT TIMES
-
-    INDICES : INDICES INDEX TIME
+    TRKBODY : TRKBODY TRKITEM
+            | TRKITEM
+
+    TRKITEM : FILE TEXT BYTEOFFSET TIMEVAL TIMEVAL
+            | FILE TEXT BYTEOFFSET TIMEVAL
+            | FILE TEXT            TIMEVAL TIMEVAL
+            | FILE TEXT            TIMEVAL
+            | DATAFILE TEXT BYTEOFFSET TIMEVAL
+            | DATAFILE TEXT BYTEOFFSET
+            | DATAFILE TEXT            TIMEVAL
+            | DATAFILE TEXT
+            | FIFO TEXT TIMEVAL
+            | SILENCE TIMEVAL
+            | ZERO TRACKMODE SUBCHMODE TIMEVAL
+            | ZERO TRACKMODE           TIMEVAL
+            | ZERO                     TIMEVAL
+            | START TIME
+            | START
             | INDEX TIME
 
-      TIMES : NUMBER TIME
-            : TIME TIME
+    TIMEVAL : TIME
+            | NUMBER
+
+Keywords that are interchangeable in the grammar are lexed to one token type with the keyword as its value
+(e.g., TRACKMODE for AUDIO, MODE1, MODE2_RAW, etc.).
+Comments are skipped by the lexer, except that the comment before a TRACK (e.g., "// Track 3") becomes the value of the TRACK token.
 """
 
+import re
 import sys
-
-import ply.lex as lex
-import ply.yacc as yacc
-
-tokens = (
-	'CD_DA',
-	'CATALOG',
-	'CD_TEXT',
-	'TRACK',
-	'AUDIO',
-	'NO',
-	'COPY',
-	'PRE_EMPHASIS',
-	'ISRC',
-	'RESERVED4',
-	'TWO_CHANNEL_AUDIO',
+import threading
+
+# PLY is imported on first use: parsing only needs ply.yacc (with the tables in _parsetab) and lexer() ply.lex
+
+class TOCError(Exception):
+	"""
+	Base class of errors raised while reading a TOC file.
+	@Line and @Column are one-based and None if unknown.
+	"""
+
+	def __init__(self, msg, line=None, column=None):
+		self._msg = msg
+		self._line = line
+		self._column = column
+		super().__init__(str(self))
+
+	def __str__(self):
+		if self._line is None:
+			return self._msg
+		return "line %d, column %d: %s" % (self._line, self._column, self._msg)
+
+	@property
+	def Message(self):
+		"""
+		Description of the error without the position.
+		"""
+		return self._msg
+
+	@property
+	def Line(self):
+		"""
+		Line number of the error.
+		"""
+		return self._line
+
+	@property
+	def Column(self):
+		"""
+		Column number of the error.
+		"""
+		return self._column
+
+class LexError(TOCError):
+	"""
+	Input contains characters or words that are not part of the TOC format.
+	"""
+	pass
+
+class ParseError(TOCError):
+	"""
+	Tokens are not in an order permitted by the grammar.
+	@Expected is a list of token types that would have been accepted.
+	"""
+
+	def __init__(self, msg, line=None, column=None, expected=None):
+		self._expected = expected or []
+		super().__init__(msg, line, column)
+
+	def __str__(self):
+		s = super().__str__()
+		if self._expected:
+			s += " (expected %s)" % ', '.join(self._expected)
+		return s
+
+	@property
+	def Expected(self):
+		"""
+		Token types that were expected at the error.
+		"""
+		return self._expected
+
+# State of the parse in progress for the lexing and error functions below.
+# If diagnostics is a list then errors are appended to it and parsing continues, otherwise they are raised.
+_state = threading.local()
+
+def _column(data, lexpos):
+	"""
+	One-based column of @lexpos within @data.
+	"""
+	return lexpos - data.rfind('\n', 0, lexpos)
+
+# Keywords are lexed as a single identifier and classified through this table, keyed on the text in the TOC file
+reserved = {
+	'CD_DA': 'TOCTYPE',
+	'CD_ROM': 'TOCTYPE',
+	'CD_ROM_XA': 'TOCTYPE',
+	'CD_I': 'TOCTYPE',
+
+	'AUDIO': 'TRACKMODE',
+	'MODE0': 'TRACKMODE',
+	'MODE1': 'TRACKMODE',
+	'MODE1_RAW': 'TRACKMODE',
+	'MODE2': 'TRACKMODE',
+	'MODE2_FORM1': 'TRACKMODE',
+	'MODE2_FORM2': 'TRACKMODE',
+	'MODE2_FORM_MIX': 'TRACKMODE',
+	'MODE2_RAW': 'TRACKMODE',
+
+	'RW': 'SUBCHMODE',
+	'RW_RAW': 'SUBCHMODE',
+
+	'CATALOG': 'CATALOG',
+	'CD_TEXT': 'CD_TEXT',
+	'TRACK': 'TRACK',
+	'NO': 'NO',
+	'COPY': 'COPY',
+	'PRE_EMPHASIS': 'PRE_EMPHASIS',
+	'TWO_CHANNEL_AUDIO': 'TWO_CHANNEL_AUDIO',
+	'FOUR_CHANNEL_AUDIO': 'FOUR_CHANNEL_AUDIO',
+	'ISRC': 'ISRC',
+	'RESERVED1': 'RESERVED1',
+	'RESERVED2': 'RESERVED2',
+	'RESERVED3': 'RESERVED3',
+	'RESERVED4': 'RESERVED4',
+	'PREGAP': 'PREGAP',
+	'START': 'START',
+	'INDEX': 'INDEX',
+
+	'LANGUAGE': 'LANGUAGE',
+	'LANGUAGE_MAP': 'LANGUAGE_MAP',
+
+	'FILE': 'FILE',
+	'AUDIOFILE': 'FILE',
+	'DATAFILE': 'DATAFILE',
+	'FIFO': 'FIFO',
+	'SILENCE': 'SILENCE',
+	'ZERO': 'ZERO',
+
+	'TITLE': 'TITLE',
+	'PERFORMER': 'PERFORMER',
+	'MESSAGE': 'MESSAGE',
+	'GENRE': 'GENRE',
+	'SIZE_INFO': 'SIZE_INFO',
+	'SONGWRITER': 'SONGWRITER',
+	'COMPOSER': 'COMPOSER',
+	'ARRANGER': 'ARRANGER',
+	'DISC_ID': 'DISC_ID',
+	'TOC_INFO1': 'TOC_INFO1',
+	'TOC_INFO2': 'TOC_INFO2',
+	'UPC_EAN': 'UPC_EAN',
+}
+
+tokens = tuple(sorted(set(reserved.values()))) + (
 	'LCURLY',
 	'RCURLY',
 	'COLON',
-	'START',
-	'INDEX',
 	'COMMA',
 
-	'LANGUAGE',
-	'LANGUAGE_MAP',
-	'FILE',
-
-	'TITLE',
-	'PERFORMER',
-	'MESSAGE',
-	'GENRE',
-	'SIZE_INFO',
-	'SONGWRITER',
-	'COMPOSER',
-	'ARRANGER',
-	'DISC_ID',
-	'TOC_INFO1',
-	'UPC_EAN',
-
-
 	'TIME',
-	'COMMENT',
+	'BYTEOFFSET',
 	'NUMBER',
 	'TEXT',
+	'KEYWORD',
 )
 
 # --------------------------------------------------------------------------------
@@ -127,47 +269,23 @@ tokens = (
 # Lexing
 
 # Regular expression rules for tokens
-t_CD_DA = r'CD_DA'
-t_CATALOG = r'CATALOG'
-t_CD_TEXT = r'CD_TEXT'
-t_TRACK = r'TRACK'
-t_AUDIO = r'AUDIO'
-t_NO = r'NO'
-t_COPY = r'COPY'
-t_PRE_EMPHASIS = r'PRE_EMPHASIS'
-t_TWO_CHANNEL_AUDIO = r'TWO_CHANNEL_AUDIO'
-t_ISRC = r'ISRC'
-t_RESERVED4 = r'RESERVED4'
 t_LCURLY = r'\{'
 t_RCURLY = r'\}'
 t_COLON = r':'
-t_START = r'START'
-t_INDEX = r'INDEX'
 t_COMMA = r','
 
-t_LANGUAGE = r'LANGUAGE'
-t_LANGUAGE_MAP = r'LANGUAGE_MAP'
-t_FILE = r'FILE'
-
-t_TITLE = r'TITLE'
-t_PERFORMER = r'PERFORMER'
-t_MESSAGE = r'MESSAGE'
-t_GENRE = r'GENRE'
-t_SIZE_INFO = r'SIZE_INFO'
-t_SONGWRITER = r'SONGWRITER'
-t_COMPOSER = r'COMPOSER'
-t_ARRANGER = r'ARRANGER'
-t_DISC_ID = r'DISC_ID'
-t_TOC_INFO1 = r'TOC_INFO1'
-t_UPC_EAN = r'UPC_EAN'
-
 def t_TIME(t):
 	r'\d+:\d+:\d+'
 	return t
 
-def t_COMMENT(t):
+def t_ignore_COMMENT(t):
 	r'\/\/[^\n]*'
-	t.value = t.value[2:].lstrip()
+	# Kept for the next TRACK token
+	t.lexer.comment = t.value[2:].lstrip()
+
+def t_BYTEOFFSET(t):
+	r'\#\d+'
+	t.value = int(t.value[1:])
 	return t
 
 def t_NUMBER(t):
@@ -176,25 +294,104 @@ def t_NUMBER(t):
 	return t
 
 def t_TEXT(t):
-	r'"(?:[^"\\]|\\.)*"'
-	# The regex skips over escaped quotes properly, but the backslashes remain in the string
-	# Need to use the decode to strip ot the escaping backslashes
-	t.value = t.value[1:-1].encode('utf-8').decode('unicode_escape')
+	r'"[^"\\]*(?:\\.[^"\\]*)*"'
+	t.value = _text(t.value)
+	return t
+
+def t_KEYWORD(t):
+	r'[A-Za-z_][A-Za-z0-9_]*'
+	# Never returned as KEYWORD, always re-typed to the reserved word
+	try:
+		t.type = reserved[t.value]
+	except KeyError:
+		_lexerror(t.lexer, "Unknown keyword %r" % t.value, t.lineno, t.lexpos)
+		return None
+
+	if t.type == 'TRACK':
+		t.value = getattr(t.lexer, 'comment', None)
+		t.lexer.comment = None
 	return t
 
 def t_newline(t):
-	r'\n+'
-	t.lexer.lineno += len(t.value)
+	r'\n[ \t\n]*'
+	# Indentation is taken with the newline as it is much faster than PLY skipping t_ignore one character at a time
+	t.lexer.lineno += t.value.count('\n')
 
 t_ignore = ' \t'
 
 def t_error(t):
-	print("Error parsing: %s" %t)
-	raise Exception("Error lexing input", str(t))
+	_lexerror(t.lexer, "Illegal character %r" % t.value[0], t.lineno, t.lexpos)
+	t.lexer.skip(1)
+
+def _lexerror(l, msg, lineno, lexpos):
+	"""
+	Raises, or records when recovering, a lexing error at @lexpos of lexer @l.
+	"""
+	err = LexError(msg, lineno, _column(l.lexdata, lexpos))
+
+	diags = getattr(_state, 'diagnostics', None)
+	if diags is None:
+		raise err
+	diags.append(err)
+
+# Backslash escapes in TEXT: octal bytes (\351) or a single character (\" or \n)
+_escapere = re.compile(r'\\([0-7]{1,3}|.)', re.DOTALL)
+
+# Replacement of each escape, every octal spelling included so that unescaping is only dictionary lookups
+_escapes = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'b': '\b', 'a': '\a', 'v': '\v'}
+for _n in (1, 2, 3):
+	for _i in range(8 ** _n):
+		_escapes[ format(_i, '0%do' % _n) ] = chr(_i & 0xFF)
+del _n, _i
+
+class _Escaped(str):
+	"""
+	TEXT whose non-ASCII characters all come from escapes, as cdrdao writes them, rather than from raw bytes in the file.
+	"""
+	__slots__ = ()
+
+def _text(s):
+	"""
+	Converts a quoted TEXT token @s to its string value.
+	Escapes are decoded in one pass to characters 0-255 that stand for the bytes of the CD-TEXT; decoding those
+	with the character set of the language is left to the caller since the language is not known here.
+	If escapes are the only non-ASCII characters then the value is an _Escaped.
+	"""
+	s = s[1:-1]
+	if '\\' not in s:
+		return s
+
+	# Split puts the escapes at the odd indices
+	parts = _escapere.split(s)
+	get = _escapes.get
+	for i in range(1, len(parts), 2):
+		e = parts[i]
+		parts[i] = get(e, e)
+
+	ret = ''.join(parts)
+	if not ret.isascii() and s.isascii():
+		return _Escaped(ret)
+	return ret
+
+# Lexer built on first use, each parse uses a clone of it
+_masterlexer = None
+
+def _newlexer():
+	"""
+	Gets a fresh lexer without rebuilding the rules.
+	"""
+	global _masterlexer
+	if _masterlexer is None:
+		import ply.lex
+		_masterlexer = ply.lex.lex(module=sys.modules[__name__])
+
+	l = _masterlexer.clone()
+	l.comment = None
+	return l
 
 def lexer(txt):
-	l = lex.lex()
-	lex.input(txt)
+	l = _newlexer()
+	l.input(txt)
 
 	toks = []
 	while True:
@@ -206,25 +403,181 @@ def lexer(txt):
 
 	return toks
 
+# Same tokens as the PLY lexer above in a single regex, used by tokenize() and the parser
+_tokenpattern = r'''
+	 (?P<TIME>\d+:\d+:\d+)
+	|(?P<NUMBER>\d+)
+	|(?P<COMMENT>//[^\n]*)
+	|(?P<BYTEOFFSET>\#\d+)
+	|(?P<TEXT>"[^"\\]*(?:\\.[^"\\]*)*")
+	|(?P<KEYWORD>[A-Za-z_][A-Za-z0-9_]*)
+	|(?P<newline>\n[ \t\n]*)
+	|(?P<ignore>[ \t]+)
+	|(?P<LCURLY>\{)
+	|(?P<RCURLY>\})
+	|(?P<COLON>:)
+	|(?P<COMMA>,)
+	|(?P<error>.)
+'''
+_tokenre = re.compile(_tokenpattern, re.VERBOSE | re.DOTALL)
+
+# Used after a string without a closing quote: no later string can be closed either (a scan from any later quote
+# falls in step with the failed one) so trying each would only rescan to the end of the input every time
+_notextre = re.compile(_tokenpattern.replace('(?P<TEXT>', '(?P<TEXT>(?!)'), re.VERBOSE | re.DOTALL)
+
+def tokenize(txt):
+	"""
+	Generator of (type, value, lineno, lexpos) tuples for @txt.
+	Yields the same tokens as the PLY lexer but without creating LexToken objects or building the lexer.
+	"""
+	return _scan(txt, None)
+
+def _scan(txt, diagnostics):
+	"""
+	Implements tokenize(), and if @diagnostics is a list then errors are appended to it and the bad input skipped.
+	"""
+	lineno = 1
+	linestart = 0
+	comment = None
+	tokenre = _tokenre
+	pos = 0
+
+	while pos is not None:
+		it = tokenre.finditer(txt, pos)
+		pos = None
+
+		for m in it:
+			typ = m.lastgroup
+			val = m.group()
+
+			if typ == 'KEYWORD':
+				try:
+					typ = reserved[val]
+				except KeyError:
+					err = LexError("Unknown keyword %r" % val, lineno, m.start() - linestart + 1)
+					if diagnostics is None:
+						raise err
+					diagnostics.append(err)
+					continue
+
+				if typ == 'TRACK':
+					val = comment
+					comment = None
+			elif typ == 'NUMBER':
+				val = int(val)
+			elif typ == 'TEXT':
+				val = _text(val)
+			elif typ == 'BYTEOFFSET':
+				val = int(val[1:])
+			elif typ == 'COMMENT':
+				comment = val[2:].lstrip()
+				continue
+			elif typ == 'newline':
+				lineno += val.count('\n')
+				linestart = m.start() + val.rfind('\n') + 1
+				continue
+			elif typ == 'ignore':
+				continue
+			elif typ == 'error':
+				if val == '"' and tokenre is _tokenre:
+					err = LexError("Unterminated string", lineno, m.start() - linestart + 1)
+					tokenre = _notextre
+					pos = m.end()
+				else:
+					err = LexError("Illegal character %r" % val, lineno, m.start() - linestart + 1)
+
+				if diagnostics is None:
+					raise err
+				diagnostics.append(err)
+
+				if pos is not None:
+					# Carry on with the other regex
+					break
+				continue
+
+			yield (typ, val, lineno, m.start())
+
+class _Token:
+	"""
+	Token handed to the parser, in place of a PLY LexToken.
+	"""
+
+	__slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+	def __repr__(self):
+		return "Token(%s,%r,%d,%d)" % (self.type, self.value, self.lineno, self.lexpos)
+
+class _Lexer:
+	"""
+	Feeds tokens from _scan() to the PLY parser, which is faster than the PLY lexer.
+	"""
+
+	def __init__(self, diagnostics=None):
+		self._diagnostics = diagnostics
+		self._toks = None
+		self.lexdata = ''
+
+	def input(self, txt):
+		self.lexdata = txt
+		self._toks = _scan(txt, self._diagnostics)
+		self._colpos = 0
+		self._linestart = 0
+
+	def column(self, lexpos):
+		"""
+		One-based column of @lexpos.
+		Positions normally only move forward, so only the text since the last call is searched for a newline and many
+		errors on one long line do not each search back to its start.
+		"""
+		if lexpos < self._colpos:
+			return _column(self.lexdata, lexpos)
+
+		i = self.lexdata.rfind('\n', self._colpos, lexpos)
+		if i >= 0:
+			self._linestart = i + 1
+		self._colpos = lexpos
+		return lexpos - self._linestart + 1
+
+	def token(self):
+		t = next(self._toks, None)
+		if t is None:
+			return None
+
+		tok = _Token()
+		tok.type, tok.value, tok.lineno, tok.lexpos = t
+		tok.lexer = self
+		return tok
+
 # --------------------------------------------------------------------------------
 # --------------------------------------------------------------------------------
 # Parsing
 
 def p_WHOLE(p):
-	'WHOLE : CD_DA CATTEXT HEADER TRKS'
-	p[0] = {'catalog': p[2], 'header': p[3], 'tracks': p[4]}
+	'WHOLE : HEADITEMS TRKS'
+	p[0] = {'type': None, 'catalog': None, 'header': None, 'tracks': p[2]}
+	for k,v in p[1]:
+		p[0][k] = v
+
+def p_HEADITEMS(p):
+	'HEADITEMS : HEADITEMS HEADITEM'
+	p[1].append(p[2])
+	p[0] = p[1]
+
+def p_HEADITEMS_term(p):
+	'HEADITEMS : HEADITEM'
+	p[0] = [p[1]]
 
-def p_WHOLE_header(p):
-	'WHOLE : CD_DA         HEADER TRKS'
-	p[0] = {'catalog': None, 'header': p[2], 'tracks': p[3]}
+def p_HEADITEM_type(p):
+	'HEADITEM : TOCTYPE'
+	p[0] = ('type', p[1])
 
-def p_WHOLE_catalog(p):
-	'WHOLE : CD_DA CATTEXT        TRKS'
-	p[0] = {'catalog': p[2], 'header': None, 'tracks': p[3]}
+def p_HEADITEM_catalog(p):
+	'HEADITEM : CATTEXT'
+	p[0] = ('catalog', p[1])
 
-def p_WHOLE_tracks(p):
-	'WHOLE : CD_DA                TRKS'
-	p[0] = {'catalog': None, 'header': None, 'tracks': p[2]}
+def p_HEADITEM_header(p):
+	'HEADITEM : HEADER'
+	p[0] = ('header', p[1])
 
 def p_CATTEXT(p):
 	'CATTEXT : CATALOG TEXT'
@@ -240,7 +593,8 @@ def p_LMAP(p):
 
 def p_LMAPOPTS(p):
 	'LMAPOPTS : LMAPOPTS LMAPOPT'
-	p[0] = p[1] + [p[2]]
+	p[1].append(p[2])
+	p[0] = p[1]
 
 def p_LMAPOPTS_term(p):
 	'LMAPOPTS : LMAPOPT'
@@ -252,43 +606,116 @@ def p_LMAPOPT(p):
 
 def p_TRKS(p):
 	'TRKS : TRKS TRK'
-	p[0] = p[1] + [p[2]]
+	p[1].append(p[2])
+	p[0] = p[1]
 
 def p_TRKS_term(p):
 	'TRKS : TRK'
 	p[0] = [p[1]]
 
-def p_TRK_CDT_ISRC(p):
-	'TRK : COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO ISRC TEXT CDT FILELINE'
-	p[0] = {'comment': p[1], 'copy': p[4], 'preemphasis': p[5], 'channels': 2, 'isrc': p[8], 'text': p[9], 'path': p[10]}
+def p_TRKS_error(p):
+	'TRKS : TRKS error'
+	# Only reached when recovering: the broken track is dropped and parsing resumes at the next TRACK
+	p[0] = p[1]
 
-def p_TRK_ISRC(p):
-	'TRK : COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO ISRC TEXT     FILELINE'
-	p[0] = {'comment': p[1], 'copy': p[4], 'preemphasis': p[5], 'channels': 2, 'isrc': p[8], 'text': None, 'path': p[9]}
+def p_TRKS_error_term(p):
+	'TRKS : error'
+	p[0] = []
 
-def p_TRK_CDT(p):
-	'TRK : COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO           CDT FILELINE'
-	p[0] = {'comment': p[1], 'copy': p[4], 'preemphasis': p[5], 'channels': 2, 'isrc': None, 'text': p[7], 'path': p[8]}
+def p_TRK_subchannel(p):
+	'TRK : TRACK TRACKMODE SUBCHMODE TRKOPTS TRKBODY'
+	p[0] = _track(p[1], p[2], p[3], p[4], p[5])
 
 def p_TRK(p):
-	'TRK : COMMENT TRACK AUDIO CPY PE TWO_CHANNEL_AUDIO               FILELINE'
-	p[0] = {'comment': p[1], 'copy': p[4], 'preemphasis': p[5], 'channels': 2, 'isrc': None, 'text': None, 'path': p[7]}
-
-def p_CPY_NO(p):
-	'CPY : NO COPY'
-	p[0] = False
-
-def p_CPY_YES(p):
-	'CPY : COPY'
-	p[0] = True
+	'TRK : TRACK TRACKMODE           TRKOPTS TRKBODY'
+	p[0] = _track(p[1], p[2], None, p[3], p[4])
+
+def _track(comment, mode, subchannel, opts, body):
+	"""
+	Assembles the dictionary of a track from its options and body items.
+	"""
+	t = opts
+	t['comment'] = comment
+	t['mode'] = mode
+	t['subchannel'] = subchannel
+	t['segments'] = []
+	t['start'] = None
+	t['indices'] = []
+
+	# Audio is two channel unless stated otherwise
+	if t['channels'] is None and mode == 'AUDIO':
+		t['channels'] = 2
+
+	segs = t['segments']
+	for k,v in body:
+		if k == 'segment':
+			segs.append(v)
+		elif k == 'start':
+			# Time given (None if not) and the number of segments it follows
+			t['start'] = (v, len(segs))
+		else:
+			t['indices'].append(v)
 
-def p_PE_NO(p):
-	'PE : NO PRE_EMPHASIS'
-	p[0] = False
+	return t
 
-def p_PE_YES(p):
-	'PE : PRE_EMPHASIS'
-	p[0] = True
+def p_TRKOPTS_nocopy(p):
+	'TRKOPTS : TRKOPTS NO COPY'
+	# Options go straight into a dictionary, rather than a TRKOPT rule each, to halve the reductions per track
+	d = p[1]
+	d['copy'] = False
+	p[0] = d
+
+def p_TRKOPTS_copy(p):
+	'TRKOPTS : TRKOPTS COPY'
+	d = p[1]
+	d['copy'] = True
+	p[0] = d
+
+def p_TRKOPTS_nopreemphasis(p):
+	'TRKOPTS : TRKOPTS NO PRE_EMPHASIS'
+	d = p[1]
+	d['preemphasis'] = False
+	p[0] = d
+
+def p_TRKOPTS_preemphasis(p):
+	'TRKOPTS : TRKOPTS PRE_EMPHASIS'
+	d = p[1]
+	d['preemphasis'] = True
+	p[0] = d
+
+def p_TRKOPTS_twochannel(p):
+	'TRKOPTS : TRKOPTS TWO_CHANNEL_AUDIO'
+	d = p[1]
+	d['channels'] = 2
+	p[0] = d
+
+def p_TRKOPTS_fourchannel(p):
+	'TRKOPTS : TRKOPTS FOUR_CHANNEL_AUDIO'
+	d = p[1]
+	d['channels'] = 4
+	p[0] = d
+
+def p_TRKOPTS_isrc(p):
+	'TRKOPTS : TRKOPTS ISRC TEXT'
+	d = p[1]
+	d['isrc'] = p[3]
+	p[0] = d
+
+def p_TRKOPTS_cdtext(p):
+	'TRKOPTS : TRKOPTS CDT'
+	d = p[1]
+	d['text'] = p[2]
+	p[0] = d
+
+def p_TRKOPTS_pregap(p):
+	'TRKOPTS : TRKOPTS PREGAP TIME'
+	d = p[1]
+	d['pregap'] = p[3]
+	p[0] = d
+
+def p_TRKOPTS_empty(p):
+	'TRKOPTS :'
+	p[0] = {'copy': False, 'preemphasis': False, 'channels': None, 'isrc': None, 'text': None, 'pregap': None}
 
 def p_CDT(p):
 	'CDT : CD_TEXT LCURLY CDLANGS RCURLY'
@@ -296,7 +723,8 @@ def p_CDT(p):
 
 def p_CDLANGS(p):
 	'CDLANGS : CDLANGS CDLANG'
-	p[0] = p[1] + [p[2]]
+	p[1].append(p[2])
+	p[0] = p[1]
 
 def p_CDLANGS_term(p):
 	'CDLANGS : CDLANG'
@@ -308,7 +736,8 @@ def p_CDLANG(p):
 
 def p_CDLANGOPTS(p):
 	'CDLANGOPTS : CDLANGOPTS CDLANGOPT'
-	p[0] = p[1] + [p[2]]
+	p[1].append(p[2])
+	p[0] = p[1]
 
 def p_CDLANGOPTS_term(p):
 	'CDLANGOPTS : CDLANGOPT'
@@ -358,6 +787,18 @@ def p_CDLANGOPT_isrc(p):
 	'CDLANGOPT : ISRC TEXT'
 	p[0] = ('isrc', p[2])
 
+def p_CDLANGOPT_reserved1(p):
+	'CDLANGOPT : RESERVED1 TEXT'
+	p[0] = ('reserved1', p[2])
+
+def p_CDLANGOPT_reserved2(p):
+	'CDLANGOPT : RESERVED2 TEXT'
+	p[0] = ('reserved2', p[2])
+
+def p_CDLANGOPT_reserved3(p):
+	'CDLANGOPT : RESERVED3 TEXT'
+	p[0] = ('reserved3', p[2])
+
 def p_CDLANGOPT_reserved4(p):
 	'CDLANGOPT : RESERVED4 TEXT'
 	p[0] = ('reserved4', p[2])
@@ -366,57 +807,342 @@ def p_CDLANGOPT_tocinfo1(p):
 	'CDLANGOPT : TOC_INFO1 LCURLY NUMBERCSV RCURLY'
 	p[0] = ('tocinfo1', p[3])
 
+def p_CDLANGOPT_tocinfo2(p):
+	'CDLANGOPT : TOC_INFO2 LCURLY NUMBERCSV RCURLY'
+	p[0] = ('tocinfo2', p[3])
+
 def p_NUMBERCSV(p):
 	'NUMBERCSV : NUMBERCSV COMMA NUMBER'
-	p[0] = p[1] + [p[3]]
+	p[1].append(p[3])
+	p[0] = p[1]
 
 def p_NUMBERCSV_term(p):
 	'NUMBERCSV : NUMBER'
 	p[0] = [p[1]]
 
-def p_FILELINE_start_index(p):
-	'FILELINE : FILE TEXT TIMES START TIME INDICES'
-	# XXX: ignores the start gap and index
-	p[0] = {'path': p[2], 'times': p[3], 'start': p[5], 'indices': p[6]}
+def p_TRKBODY(p):
+	'TRKBODY : TRKBODY TRKITEM'
+	p[1].append(p[2])
+	p[0] = p[1]
 
-def p_FILELINE_index(p):
-	'FILELINE : FILE TEXT TIMES            INDICES'
-	# XXX: ignores the start gap
-	p[0] = {'path': p[2], 'times': p[3], 'indices': p[4]}
+def p_TRKBODY_term(p):
+	'TRKBODY : TRKITEM'
+	p[0] = [p[1]]
 
-def p_FILELINE_start(p):
-	'FILELINE : FILE TEXT TIMES START TIME'
-	# XXX: ignores the start gap
-	p[0] = {'path': p[2], 'times': p[3], 'start': p[5]}
+def p_TRKITEM_file_offset_length(p):
+	'TRKITEM : FILE TEXT BYTEOFFSET TIMEVAL TIMEVAL'
+	p[0] = ('segment', {'kind': 'file', 'path': p[2], 'offset': p[3], 'start': p[4], 'length': p[5]})
 
-def p_FILELINE(p):
-	'FILELINE : FILE TEXT TIMES'
-	p[0] = {'path': p[2], 'times': p[3]}
+def p_TRKITEM_file_offset(p):
+	'TRKITEM : FILE TEXT BYTEOFFSET TIMEVAL'
+	p[0] = ('segment', {'kind': 'file', 'path': p[2], 'offset': p[3], 'start': p[4], 'length': None})
 
-def p_INDICES(p):
-	'INDICES : INDICES INDEX TIME'
-	p[0] = p[1].append(p[3])
+def p_TRKITEM_file_length(p):
+	'TRKITEM : FILE TEXT            TIMEVAL TIMEVAL'
+	p[0] = ('segment', {'kind': 'file', 'path': p[2], 'offset': 0, 'start': p[3], 'length': p[4]})
 
-def p_INDICES_index(p):
-	'INDICES : INDEX TIME'
-	p[0] = [p[2]]
+def p_TRKITEM_file(p):
+	'TRKITEM : FILE TEXT            TIMEVAL'
+	p[0] = ('segment', {'kind': 'file', 'path': p[2], 'offset': 0, 'start': p[3], 'length': None})
 
-def p_TIMES_number(p):
-	'TIMES : NUMBER TIME'
-	p[0] = (p[1], p[2])
+def p_TRKITEM_datafile_offset_length(p):
+	'TRKITEM : DATAFILE TEXT BYTEOFFSET TIMEVAL'
+	p[0] = ('segment', {'kind': 'datafile', 'path': p[2], 'offset': p[3], 'start': 0, 'length': p[4]})
 
-def p_TIMES_time(p):
-	'TIMES : TIME TIME'
-	p[0] = (p[1], p[2])
+def p_TRKITEM_datafile_offset(p):
+	'TRKITEM : DATAFILE TEXT BYTEOFFSET'
+	p[0] = ('segment', {'kind': 'datafile', 'path': p[2], 'offset': p[3], 'start': 0, 'length': None})
 
+def p_TRKITEM_datafile_length(p):
+	'TRKITEM : DATAFILE TEXT            TIMEVAL'
+	p[0] = ('segment', {'kind': 'datafile', 'path': p[2], 'offset': 0, 'start': 0, 'length': p[3]})
 
-def p_error(p):
-	print("Syntax error")
-	print(p)
-	raise Exception("Syntax error while yacc'ing the input", str(p))
+def p_TRKITEM_datafile(p):
+	'TRKITEM : DATAFILE TEXT'
+	p[0] = ('segment', {'kind': 'datafile', 'path': p[2], 'offset': 0, 'start': 0, 'length': None})
 
+def p_TRKITEM_fifo(p):
+	'TRKITEM : FIFO TEXT TIMEVAL'
+	p[0] = ('segment', {'kind': 'fifo', 'path': p[2], 'offset': 0, 'start': 0, 'length': p[3]})
 
-def yaccer(txt, debug=False):
-	parser = yacc.yacc(debug=debug)
-	return parser.parse(txt, lexer=lex.lex())
+def p_TRKITEM_silence(p):
+	'TRKITEM : SILENCE TIMEVAL'
+	p[0] = ('segment', {'kind': 'silence', 'path': None, 'offset': 0, 'start': 0, 'length': p[2]})
 
+def p_TRKITEM_zero_mode_subchannel(p):
+	'TRKITEM : ZERO TRACKMODE SUBCHMODE TIMEVAL'
+	p[0] = ('segment', {'kind': 'zero', 'path': None, 'offset': 0, 'start': 0, 'length': p[4], 'mode': p[2], 'subchannel': p[3]})
+
+def p_TRKITEM_zero_mode(p):
+	'TRKITEM : ZERO TRACKMODE           TIMEVAL'
+	p[0] = ('segment', {'kind': 'zero', 'path': None, 'offset': 0, 'start': 0, 'length': p[3], 'mode': p[2]})
+
+def p_TRKITEM_zero(p):
+	'TRKITEM : ZERO                     TIMEVAL'
+	p[0] = ('segment', {'kind': 'zero', 'path': None, 'offset': 0, 'start': 0, 'length': p[2]})
+
+def p_TRKITEM_start_time(p):
+	'TRKITEM : START TIME'
+	p[0] = ('start', p[2])
+
+def p_TRKITEM_start(p):
+	'TRKITEM : START'
+	p[0] = ('start', None)
+
+def p_TRKITEM_index(p):
+	'TRKITEM : INDEX TIME'
+	p[0] = ('index', p[2])
+
+def p_TIMEVAL(p):
+	'''TIMEVAL : TIME
+	           | NUMBER'''
+	p[0] = p[1]
+
+
+def p_error(p):
+	parser = _state.parser
+	expected = sorted(t for t in parser.action[parser.state] if t != 'error')
+
+	if p is None:
+		data = _state.lexer.lexdata
+		err = ParseError("Unexpected end of input", data.count('\n') + 1, _column(data, len(data)), expected)
+	else:
+		err = ParseError("Unexpected %s %r" % (p.type, p.value), p.lineno, p.lexer.column(p.lexpos), expected)
+
+	if _state.diagnostics is None:
+		raise err
+
+	# Let PLY discard tokens until a TRKS error rule can resume
+	_state.diagnostics.append(err)
+
+# Module holding the generated LALR tables
+_tabmodule = '_parsetab'
+
+def _newparser(debug=False):
+	"""
+	Gets a parser for the grammar in this module.
+	Normally this is a _Parser over the tables in _parsetab so that PLY is not imported at all.
+	If the grammar no longer matches the tables (or @debug is set) then PLY generates them in memory, which is slow;
+	run _writetables() after changing the grammar.
+	"""
+	if not debug:
+		from . import _parsetab
+		if _parsetab._tabversion == '3.10' and _parsetab._lr_signature == _signature():
+			return _Parser(_parsetab, globals())
+
+	import ply.yacc
+	return ply.yacc.yacc(module=sys.modules[__name__], tabmodule=_tabmodule, write_tables=False, debug=debug)
+
+def _writetables():
+	"""
+	Regenerates tocparser/_parsetab.py after a change to the grammar.
+
+		python3 -c 'from tocparser import lex; lex._writetables()'
+	"""
+	import os
+	import ply.yacc
+	ply.yacc.yacc(module=sys.modules[__name__], tabmodule=_tabmodule, outputdir=os.path.dirname(os.path.abspath(__file__)), write_tables=True, debug=False)
+
+def _signature():
+	"""
+	Grammar signature computed the same way as PLY does to check that _parsetab is current: the tokens and the rule docstrings in source order.
+	"""
+	funcs = sorted((f.__code__.co_firstlineno, f.__doc__) for k,f in globals().items() if k.startswith('p_') and k != 'p_error')
+	return ' '.join(sorted(tokens)) + ''.join(doc for line,doc in funcs if doc)
+
+class _Symbol:
+	"""
+	Nonterminal (or error) on the parse stack.
+	"""
+
+	__slots__ = ('type', 'value', 'lineno', 'lexpos')
+
+	def __init__(self, type, value=None):
+		self.type = type
+		self.value = value
+
+class _Production:
+	"""
+	The p argument of grammar rule functions: p[0] is the result and p[1:] the values of the matched symbols.
+	"""
+
+	__slots__ = ('slice',)
+
+	def __getitem__(self, n):
+		return self.slice[n].value
+
+	def __setitem__(self, n, v):
+		self.slice[n].value = v
+
+	def __len__(self):
+		return len(self.slice)
+
+class _Parser:
+	"""
+	LALR parser driven by the generated tables in @tab, binding rule functions by name from @pdict.
+	This is PLY's LRParser.parse() (without position tracking) including its error recovery, so PLY
+	is only needed to generate the tables.
+	"""
+
+	def __init__(self, tab, pdict):
+		self.action = tab._lr_action
+		self.goto = tab._lr_goto
+		self.state = 0
+
+		# (name, length, function) of each rule
+		self._productions = [(p[1], p[2], pdict[p[3]] if p[3] else None) for p in tab._lr_productions]
+
+		# States with a single reduction do not need to look ahead
+		self._defaulted = {}
+		for state, actions in self.action.items():
+			rules = list(actions.values())
+			if len(rules) == 1 and rules[0] < 0:
+				self._defaulted[state] = rules[0]
+
+	def parse(self, txt, lexer):
+		actions = self.action
+		goto = self.goto
+		prods = self._productions
+		defaulted = self._defaulted
+		get_token = lexer.token
+
+		lexer.input(txt)
+
+		pslice = _Production()
+		statestack = [0]
+		symstack = [_Symbol('$end')]
+		state = 0
+		lookahead = None
+		lookaheadstack = []
+
+		# Tokens to shift after an error before reporting another one
+		errorcount = 0
+
+		while True:
+			if state in defaulted:
+				t = defaulted[state]
+			else:
+				if lookahead is None:
+					if lookaheadstack:
+						lookahead = lookaheadstack.pop()
+					else:
+						lookahead = get_token()
+						if lookahead is None:
+							lookahead = _Symbol('$end')
+
+				t = actions[state].get(lookahead.type)
+
+			if t is not None:
+				if t > 0:
+					# Shift
+					statestack.append(t)
+					state = t
+					symstack.append(lookahead)
+					lookahead = None
+					if errorcount:
+						errorcount -= 1
+					continue
+
+				if t < 0:
+					# Reduce
+					pname, plen, func = prods[-t]
+					sym = _Symbol(pname)
+
+					if plen:
+						targ = symstack[-plen-1:]
+						targ[0] = sym
+						del symstack[-plen:]
+						del statestack[-plen:]
+					else:
+						targ = [sym]
+
+					pslice.slice = targ
+					self.state = state
+					func(pslice)
+
+					symstack.append(sym)
+					state = goto[statestack[-1]][pname]
+					statestack.append(state)
+					continue
+
+				# Accept
+				return getattr(symstack[-1], 'value', None)
+
+			# Syntax error: report it unless still recovering from the last one
+			if errorcount == 0:
+				errtoken = lookahead if lookahead.type != '$end' else None
+				self.state = state
+				p_error(errtoken)
+			errorcount = 3
+
+			# Nothing on the stack to unwind, so drop the token and start over
+			if len(statestack) <= 1 and lookahead.type != '$end':
+				lookahead = None
+				state = 0
+				del lookaheadstack[:]
+				continue
+
+			if lookahead.type == '$end':
+				return None
+
+			if lookahead.type != 'error':
+				if symstack[-1].type == 'error':
+					# Already recovering, discard the token
+					lookahead = None
+					continue
+
+				# Push back the token and look ahead with an error symbol instead
+				err = _Symbol('error', lookahead)
+				err.lineno = lookahead.lineno
+				err.lexpos = lookahead.lexpos
+				lookaheadstack.append(lookahead)
+				lookahead = err
+			else:
+				# Unwind the stack until a state can shift the error symbol
+				symstack.pop()
+				statestack.pop()
+				state = statestack[-1]
+
+# Start of a line with a TRACK keyword
+_tracksync = re.compile(r'^[ \t]*TRACK\b', re.M)
+
+def yaccer(txt, debug=False, diagnostics=None):
+	"""
+	Parses @txt and returns the parsed structure.
+	If @diagnostics is a list then the parser recovers from errors by skipping to the next track, appends a TOCError to
+	it for each error, and returns what could be parsed (None if nothing). Otherwise the first error is raised.
+	"""
+	# Parsers keep state while parsing so each thread builds its own, once
+	if debug:
+		parser = _newparser(debug=True)
+	else:
+		parser = getattr(_state, 'cachedparser', None)
+		if parser is None:
+			parser = _state.cachedparser = _newparser()
+
+	l = _Lexer(diagnostics)
+
+	_state.parser = parser
+	_state.lexer = l
+	_state.diagnostics = diagnostics
+	try:
+		ret = parser.parse(txt, lexer=l)
+
+		# PLY gives up on an error at the end of input, so drop the last (truncated) track and try once more
+		if ret is None and diagnostics:
+			m = None
+			for m in _tracksync.finditer(txt):
+				pass
+
+			if m is not None and m.start() > 0:
+				# Errors before the cut were already recorded by the first attempt
+				l = _Lexer([])
+				_state.diagnostics = l._diagnostics
+				_state.lexer = l
+				ret = parser.parse(txt[:m.start()], lexer=l)
+
+		return ret
+	finally:
+		_state.parser = None
+		_state.lexer = None
+		_state.diagnostics = None
@@ -0,0 +1,592 @@
+"""
+Watches a directory tree for TOC files that are added, changed, or removed.
+A manifest of (path, mtime, size, digest) to the parsed record of each file (the same record as the command line tool
+writes) is kept, optionally on disk, so that only files that changed are parsed again, including across restarts.
+
+Changes are picked up through inotify on Linux, which costs nothing while the tree is idle, and otherwise by
+polling the tree with os.scandir every few seconds. Changed files are parsed on a pool of worker processes and
+reported to the callback in batches once they have settled.
+
+	def changed(events):
+		for e in events:
+			print(e.Kind, e.Path)
+
+	w = tocparser.watch('/srv/spool', changed, manifest='/srv/spool.manifest')
+	...
+	w.Stop()
+"""
+
+import functools
+import json
+import multiprocessing
+import os
+import select
+import stat
+import struct
+import threading
+import time
+
+from .cli import _inspect
+
+class FileEvent:
+	"""
+	A TOC file that was added, modified, or removed.
+	"""
+
+	__slots__ = ('_kind', '_path', '_record', '_previous')
+
+	def __init__(self, kind, path, record, previous):
+		self._kind = kind
+		self._path = path
+		self._record = record
+		self._previous = previous
+
+	def __repr__(self):
+		return "<FileEvent %s %s>" % (self._kind, self._path)
+
+	@property
+	def Kind(self):
+		"""
+		One of 'added', 'modified', or 'removed'.
+		"""
+		return self._kind
+
+	@property
+	def Path(self):
+		"""
+		Path of the file.
+		"""
+		return self._path
+
+	@property
+	def Record(self):
+		"""
+		Parsed record of the file as written by the command line tool (e.g., Record['digest'], Record['tracks']), None if removed.
+		Files that failed to parse have Record['error'] set.
+		"""
+		return self._record
+
+	@property
+	def Previous(self):
+		"""
+		Record of the file before the change, None if added.
+		"""
+		return self._previous
+
+class Watcher:
+	"""
+	Watches the directory tree at @root and calls @callback with a list of FileEvent for each batch of changes.
+	The first batch reconciles the tree with the manifest, so without a @manifest file every TOC file is reported as added.
+
+	@manifest is the path of a file to keep the manifest in between runs (kept in memory only if None).
+	@debounce is how many seconds a change must settle before it is reported; events arriving in that time are batched.
+	@interval is how many seconds apart the tree is polled if inotify is not used.
+	@jobs is the number of worker processes to parse with (default: number of CPUs; 1 parses in this process).
+	@recover is passed to TOC.load().
+	@inotify can be set to False to always poll.
+	"""
+
+	def __init__(self, root, callback, manifest=None, debounce=1.0, interval=5.0, jobs=None, recover=False, inotify=True):
+		self._root = os.path.abspath(root)
+		self._callback = callback
+		self._manifestpath = manifest
+		self._debounce = debounce
+		self._interval = interval
+		self._jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+		self._recover = recover
+		self._useinotify = inotify
+
+		# Relative path to (mtime_ns, size, digest, record)
+		self._manifest = {}
+		self._logfile = None
+		self._loglines = 0
+
+		self._inotify = None
+		self._pool = None
+		self._stopped = False
+		self._wake = os.pipe()
+		self._thread = None
+		self._error = None
+
+	def __del__(self):
+		for fd in self._wake:
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+
+	@property
+	def Root(self):
+		"""
+		Absolute path of the directory being watched.
+		"""
+		return self._root
+
+	@property
+	def Manifest(self):
+		"""
+		Dictionary of path relative to Root to (mtime in ns, size, digest, record) of each known TOC file.
+		"""
+		return self._manifest
+
+	@property
+	def UsingInotify(self):
+		"""
+		True if changes are picked up through inotify, False if polling (only known once running).
+		"""
+		return self._inotify is not None
+
+	def Start(self):
+		"""
+		Runs the watcher on a background thread and returns self.
+		"""
+		self._thread = threading.Thread(target=self._run, name='tocparser-watch', daemon=True)
+		self._thread.start()
+		return self
+
+	def Join(self, timeout=None):
+		"""
+		Waits for the background thread to end, for at most @timeout seconds.
+		An exception that ended it (e.g., raised by the callback) is raised again here.
+		"""
+		if self._thread is not None:
+			self._thread.join(timeout)
+
+		if self._error is not None:
+			e = self._error
+			self._error = None
+			raise e
+
+	def Stop(self):
+		"""
+		Stops the watcher (from any thread, including the callback) and waits for the background thread if there is one.
+		"""
+		self._stopped = True
+		os.write(self._wake[1], b'x')
+
+		if self._thread is not None and self._thread is not threading.current_thread():
+			self.Join()
+
+	def _run(self):
+		try:
+			self.Run()
+		except BaseException as e:
+			self._error = e
+
+	def Run(self):
+		"""
+		Watches in the calling thread until Stop() is called.
+		"""
+		self._loadmanifest()
+
+		if self._useinotify:
+			try:
+				self._inotify = _Inotify(self._root)
+			except OSError:
+				# Not Linux, or out of watches: poll instead
+				self._inotify = None
+
+		if self._jobs > 1:
+			self._pool = multiprocessing.Pool(self._jobs)
+
+		try:
+			self._loop()
+		finally:
+			if self._pool is not None:
+				self._pool.terminate()
+				self._pool.join()
+				self._pool = None
+			if self._inotify is not None:
+				self._inotify.close()
+				self._inotify = None
+			if self._logfile is not None:
+				self._logfile.close()
+				self._logfile = None
+
+	def _loop(self):
+		# Paths waiting to be looked at, to the (mtime_ns, size) they had when seen changing (None if not known)
+		# and the times of the first and most recent change among them
+		pending = self._reconcile()
+		first = last = time.monotonic()
+
+		fds = [self._wake[0]]
+		if self._inotify is not None:
+			fds.append(self._inotify.fileno())
+			nextpoll = None
+		else:
+			nextpoll = first + self._interval
+
+		while not self._stopped:
+			due = None
+			if pending:
+				# Keep batching while changes keep coming, but not forever
+				due = min(last + self._debounce, first + 10 * self._debounce)
+			if nextpoll is not None and (due is None or nextpoll < due):
+				due = nextpoll
+
+			timeout = None if due is None else max(0.0, due - time.monotonic())
+			ready = select.select(fds, [], [], timeout)[0]
+			now = time.monotonic()
+
+			if self._wake[0] in ready:
+				os.read(self._wake[0], 4096)
+				continue
+
+			found = {}
+			if self._inotify is not None and self._inotify.fileno() in ready:
+				paths, prefixes, overflow = self._inotify.read()
+				if overflow:
+					found = self._reconcile()
+				for rel in paths:
+					found[rel] = None
+				for prefix in prefixes:
+					for rel in self._manifest:
+						if rel.startswith(prefix):
+							found[rel] = None
+
+			if nextpoll is not None and now >= nextpoll:
+				# Only what changed since the last poll counts as a new change
+				found = {k: v for k,v in self._reconcile().items() if k not in pending or pending[k] != v}
+				nextpoll = now + self._interval
+
+			if found:
+				if not pending:
+					first = now
+				last = now
+				pending.update(found)
+
+			if pending and now >= min(last + self._debounce, first + 10 * self._debounce):
+				pending = self._flush(pending, now >= first + 10 * self._debounce)
+				first = last = now
+
+	def _reconcile(self):
+		"""
+		Scans the whole tree and returns the paths that differ from the manifest, to their (mtime_ns, size) (None if gone).
+		"""
+		ret = {}
+		seen = set()
+		m = self._manifest
+
+		for rel, st in _scantree(self._root):
+			seen.add(rel)
+			old = m.get(rel)
+			if old is None or old[0] != st.st_mtime_ns or old[1] != st.st_size:
+				ret[rel] = (st.st_mtime_ns, st.st_size)
+
+		for rel in m:
+			if rel not in seen:
+				ret[rel] = None
+
+		return ret
+
+	def _flush(self, pending, force):
+		"""
+		Parses the files in @pending that changed, updates the manifest, and calls the callback.
+		Files still being written (their size or mtime moved since they were seen changing) are returned to be looked at later,
+		unless @force is set.
+		"""
+		later = {}
+		toparse = []
+		events = []
+		m = self._manifest
+
+		for rel in sorted(pending):
+			path = os.path.join(self._root, rel)
+			try:
+				st = os.stat(path)
+			except OSError:
+				st = None
+
+			if st is None or not stat.S_ISREG(st.st_mode):
+				old = m.pop(rel, None)
+				if old is not None:
+					self._log(rel, None)
+					events.append( FileEvent('removed', path, None, old[3]) )
+				continue
+
+			cur = (st.st_mtime_ns, st.st_size)
+			seen = pending[rel]
+			if seen is not None and seen != cur and not force:
+				later[rel] = cur
+				continue
+
+			old = m.get(rel)
+			if old is not None and (old[0], old[1]) == cur:
+				continue
+
+			toparse.append( (rel, path, cur) )
+
+		paths = [x[1] for x in toparse]
+		func = functools.partial(_inspect, recover=self._recover)
+		if self._pool is not None and len(paths) > 1:
+			recs = self._pool.imap(func, paths, chunksize=16)
+		else:
+			recs = map(func, paths)
+
+		for (rel, path, cur), rec in zip(toparse, recs):
+			old = m.get(rel)
+			entry = (cur[0], cur[1], rec['digest'], rec)
+			m[rel] = entry
+			self._log(rel, entry)
+
+			if old is None:
+				events.append( FileEvent('added', path, rec, None) )
+			elif old[2] != rec['digest'] or (rec['digest'] is None and old[3] != rec):
+				# Files that were only touched keep their digest and are not reported
+				events.append( FileEvent('modified', path, rec, old[3]) )
+
+		self._savemanifest()
+
+		if events:
+			self._callback(events)
+
+		return later
+
+	def _loadmanifest(self):
+		"""
+		Reads the manifest file (JSON lines appended as files change, the last line for a path wins) and rewrites it compacted.
+		"""
+		if self._manifestpath is None:
+			return
+
+		try:
+			with open(self._manifestpath, encoding='utf-8') as f:
+				for line in f:
+					try:
+						o = json.loads(line)
+					except ValueError:
+						# Partly written line of a run that was killed
+						continue
+
+					if o.get('removed'):
+						self._manifest.pop(o['path'], None)
+					else:
+						self._manifest[ o['path'] ] = (o['mtime_ns'], o['size'], o['digest'], o['record'])
+		except FileNotFoundError:
+			pass
+
+		self._compact()
+
+	def _compact(self):
+		"""
+		Rewrites the manifest file with one line per known file.
+		"""
+		if self._logfile is not None:
+			self._logfile.close()
+
+		tmp = self._manifestpath + '.tmp'
+		with open(tmp, 'w', encoding='utf-8') as f:
+			for rel in sorted(self._manifest):
+				f.write(_manifestline(rel, self._manifest[rel]))
+		os.replace(tmp, self._manifestpath)
+
+		self._logfile = open(self._manifestpath, 'a', encoding='utf-8')
+		self._loglines = len(self._manifest)
+
+	def _log(self, rel, entry):
+		if self._logfile is not None:
+			self._logfile.write(_manifestline(rel, entry))
+			self._loglines += 1
+
+	def _savemanifest(self):
+		if self._logfile is None:
+			return
+
+		if self._loglines > 2 * len(self._manifest) + 1000:
+			self._compact()
+		else:
+			self._logfile.flush()
+
+def _manifestline(rel, entry):
+	if entry is None:
+		return json.dumps({'path': rel, 'removed': True}, ensure_ascii=False) + '\n'
+	return json.dumps({'path': rel, 'mtime_ns': entry[0], 'size': entry[1], 'digest': entry[2], 'record': entry[3]}, ensure_ascii=False) + '\n'
+
+def _istoc(name):
+	return name.lower().endswith('.toc')
+
+def _scantree(root, rel=''):
+	"""
+	Generator of (relative path, stat result) of the TOC files under @root, starting from directory @rel within it.
+	"""
+	stack = [rel]
+	while stack:
+		d = stack.pop()
+		try:
+			it = os.scandir(os.path.join(root, d))
+		except OSError:
+			# Removed while scanning, or not readable
+			continue
+
+		with it:
+			for e in it:
+				try:
+					if e.is_dir(follow_symlinks=False):
+						stack.append(os.path.join(d, e.name))
+					elif _istoc(e.name) and e.is_file():
+						yield os.path.join(d, e.name), e.stat()
+				except OSError:
+					continue
+
+# From <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+
+# struct inotify_event header: wd, mask, cookie, len
+_eventhead = struct.Struct('iIII')
+
+class _Inotify:
+	"""
+	Recursive inotify watch of a directory tree through ctypes.
+	Raises OSError if inotify is not available.
+	"""
+
+	def __init__(self, root):
+		try:
+			import ctypes
+			libc = ctypes.CDLL(None, use_errno=True)
+			self._init = libc.inotify_init1
+			self._add = libc.inotify_add_watch
+			self._rm = libc.inotify_rm_watch
+		except (ImportError, AttributeError) as e:
+			raise OSError("inotify is not available: %s" % e)
+
+		self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+		self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+		self._ctypes = ctypes
+
+		self._root = root
+		self._fd = self._init(os.O_NONBLOCK | os.O_CLOEXEC)
+		if self._fd < 0:
+			self._raise()
+
+		# Watch descriptor to relative directory path and back
+		self._dirs = {}
+		self._wds = {}
+
+		try:
+			self._watchtree('')
+		except OSError:
+			self.close()
+			raise
+
+	def fileno(self):
+		return self._fd
+
+	def close(self):
+		if self._fd >= 0:
+			os.close(self._fd)
+			self._fd = -1
+
+	def _raise(self):
+		e = self._ctypes.get_errno()
+		raise OSError(e, os.strerror(e))
+
+	def _watchtree(self, rel):
+		"""
+		Watches directory @rel and every directory under it, returns the TOC files found in them.
+		Files are listed after the watch is added so that none created in between are missed.
+		"""
+		found = []
+		stack = [rel]
+		while stack:
+			d = stack.pop()
+			wd = self._add(self._fd, os.fsencode(os.path.join(self._root, d)), _IN_MASK)
+			if wd < 0:
+				e = self._ctypes.get_errno()
+				if e in (2, 20):
+					# ENOENT, ENOTDIR: removed since it was seen
+					continue
+				raise OSError(e, os.strerror(e))
+
+			self._dirs[wd] = d
+			self._wds[d] = wd
+
+			try:
+				with os.scandir(os.path.join(self._root, d)) as it:
+					for e in it:
+						if e.is_dir(follow_symlinks=False):
+							stack.append(os.path.join(d, e.name))
+						elif _istoc(e.name):
+							found.append(os.path.join(d, e.name))
+			except OSError:
+				continue
+
+		return found
+
+	def _unwatchtree(self, rel):
+		"""
+		Stops watching directory @rel and every directory under it.
+		"""
+		prefix = os.path.join(rel, '')
+		for d in [d for d in self._wds if d == rel or d.startswith(prefix)]:
+			wd = self._wds.pop(d)
+			del self._dirs[wd]
+			# Fails harmlessly if the kernel already dropped it
+			self._rm(self._fd, wd)
+
+	def read(self):
+		"""
+		Reads pending events and returns (TOC files that may have changed, directory prefixes whose files may be gone, overflow).
+		On overflow events were lost and the whole tree must be rescanned.
+		"""
+		paths = set()
+		prefixes = set()
+		overflow = False
+
+		while True:
+			try:
+				buf = os.read(self._fd, 65536)
+			except BlockingIOError:
+				break
+			if not buf:
+				break
+
+			off = 0
+			while off < len(buf):
+				wd, mask, cookie, namelen = _eventhead.unpack_from(buf, off)
+				name = os.fsdecode(buf[off+16:off+16+namelen].rstrip(b'\0'))
+				off += 16 + namelen
+
+				if mask & _IN_Q_OVERFLOW:
+					overflow = True
+					continue
+
+				d = self._dirs.get(wd)
+				if d is None:
+					continue
+
+				if mask & _IN_IGNORED:
+					del self._dirs[wd]
+					self._wds.pop(d, None)
+					continue
+
+				if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+					if d == '':
+						# The root itself went away
+						overflow = True
+					continue
+
+				path = os.path.join(d, name)
+
+				if mask & _IN_ISDIR:
+					if mask & (_IN_CREATE | _IN_MOVED_TO):
+						paths.update(self._watchtree(path))
+					if mask & (_IN_DELETE | _IN_MOVED_FROM):
+						self._unwatchtree(path)
+						prefixes.add(os.path.join(path, ''))
+				elif _istoc(name):
+					paths.add(path)
+
+		return paths, prefixes, overflow